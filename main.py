@@ -6,26 +6,155 @@ Deep Research Clone - 改善版
 """
 
 import os
+import sys
+import argparse
 import json
 import requests
-from typing import List, Dict, Optional, Set, Union
-from dataclasses import dataclass
+from typing import List, Dict, NamedTuple, Optional, Set, Union
+from dataclasses import dataclass, asdict
 from pathlib import Path
-import markdown
 from dotenv import load_dotenv
 import re
 import yaml
 from datetime import datetime, timedelta
 import time
 import random
+import threading
+import hashlib
+import sqlite3
+import bisect
+import math
+import unicodedata
+from operator import attrgetter
+from functools import lru_cache
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from pydantic import BaseModel, Field, validator
 from urllib.parse import quote_plus
-from bs4 import BeautifulSoup
+from email.utils import parsedate_to_datetime
+from requests.adapters import HTTPAdapter
+
+try:
+    import orjson  # 任意: インストールされていればJSONの解析を高速化
+except ImportError:
+    orjson = None
+
+# libyamlがあればC実装のローダーを使用
+_YamlLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
 
 # 環境変数を読み込み
 load_dotenv()
 
-@dataclass
+def _json_loads(data: Union[str, bytes]):
+    """JSONを解析（orjsonがあれば使用）"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _json_dumps(obj, indent: bool = False) -> str:
+    """JSON文字列に変換（orjsonがあれば使用。非ASCII文字はエスケープしない）"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0).decode('utf-8')
+    return json.dumps(obj, ensure_ascii=False, indent=2 if indent else None)
+
+# ${VAR_NAME} 形式の環境変数参照（文字列の一部に含まれていても展開する）
+_ENV_VAR_PATTERN = re.compile(r'\$\{([^}]+)\}')
+
+def _expand_env_var_match(match: "re.Match") -> str:
+    """環境変数参照1件を展開（未設定ならそのまま残す）"""
+    env_var = match.group(1)
+    expanded_value = os.getenv(env_var)
+    if expanded_value is None:
+        print(f"⚠️  環境変数が見つかりません: {env_var}")
+        return match.group(0)
+    print(f"🔧 環境変数を展開: {env_var} = {expanded_value[:10]}...")
+    return expanded_value
+
+def _expand_env_vars(obj):
+    """辞書・リスト内の環境変数を展開"""
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            if isinstance(value, str):
+                if '${' in value:
+                    obj[key] = _ENV_VAR_PATTERN.sub(_expand_env_var_match, value)
+            elif isinstance(value, (dict, list)):
+                _expand_env_vars(value)
+    elif isinstance(obj, list):
+        for i, item in enumerate(obj):
+            if isinstance(item, str):
+                if '${' in item:
+                    obj[i] = _ENV_VAR_PATTERN.sub(_expand_env_var_match, item)
+            elif isinstance(item, (dict, list)):
+                _expand_env_vars(item)
+
+def _load_config_document(path: str, mtime: float) -> Dict:
+    """設定ファイルを解析（YAMLより新しいJSONキャッシュがあればそちらを読み込む）"""
+    # キャッシュには環境変数を展開する前の内容を保存する（秘密情報を書き出さないため）
+    cache_path = f"{path}.json"
+    try:
+        if os.path.getmtime(cache_path) >= mtime:
+            with open(cache_path, 'rb') as f:
+                return _json_loads(f.read())
+    except (OSError, ValueError):
+        pass
+
+    with open(path, 'r', encoding='utf-8') as f:
+        config = yaml.load(f, Loader=_YamlLoader)
+
+    temp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        serialized = _json_dumps(config)
+        # 数値のキーや日付などJSONで同じ内容に戻せない設定はキャッシュしない
+        if _json_loads(serialized) == config:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                f.write(serialized)
+            os.replace(temp_path, cache_path)
+    except (OSError, TypeError, ValueError):
+        # 書き込めない場所にある設定ファイルなどはキャッシュせずに続行
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    return config
+
+@lru_cache(maxsize=8)
+def _read_config_file(path: str, mtime: float) -> Dict:
+    """設定ファイルを解析して環境変数を展開（パスと更新時刻をキーにキャッシュし、編集されたら読み直す）"""
+    config = _load_config_document(path, mtime)
+    _expand_env_vars(config)
+    return config
+
+def _create_http_session(pool_maxsize: int = 16) -> requests.Session:
+    """接続を使い回すHTTPセッションを作成（並行リクエスト分の接続をプールしておく）"""
+    session = requests.Session()
+    # リトライは呼び出し側でログを出しながら行うため、アダプタでは行わない
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_maxsize, pool_block=False)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+def _truncate_middle(text: str, max_chars: int, marker: str = "\n…（中略）…\n") -> str:
+    """中間部分を省略してmax_chars文字以内にする（先頭の指示と末尾の新しい情報を残す）"""
+    if len(text) <= max_chars:
+        return text
+    keep = max(max_chars - len(marker), 0)
+    head_end = keep // 2
+    tail_start = len(text) - (keep - head_end)
+    # 行の途中で切らないよう、省略する範囲を行の境界まで広げる
+    newline = text.rfind('\n', 0, head_end)
+    if newline > 0:
+        head_end = newline
+    newline = text.find('\n', tail_start)
+    if newline != -1:
+        tail_start = newline + 1
+    return text[:head_end] + marker + text[tail_start:]
+
+def _compile_substring_pattern(words: List[str]) -> "re.Pattern":
+    """いずれかの部分文字列に一致する正規表現を作成（1回の走査で判定するため）"""
+    return re.compile('|'.join(re.escape(word) for word in words))
+
+# Python 3.10以降ではインスタンスの__dict__を持たないslots付きのデータクラスにする
+_DATACLASS_OPTIONS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(**_DATACLASS_OPTIONS)
 class SearchResult:
     """検索結果を格納するデータクラス"""
     title: str
@@ -36,7 +165,7 @@ class SearchResult:
     reliability_score: float = 1.0  # 信頼性スコア（0.0-1.0）
     source_type: str = "unknown"  # 情報源タイプ（official, news, academic, blog, etc.）
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class Citation:
     """引用情報を格納するデータクラス"""
     source_title: str
@@ -46,7 +175,7 @@ class Citation:
     relevance_score: float = 1.0
     date_info: Optional[str] = None  # 日付情報
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class ResearchResult:
     """研究結果を格納するデータクラス"""
     query: str
@@ -57,39 +186,72 @@ class ResearchResult:
     additional_queries: List[str]
     final_report: str
 
+class DateInfo(NamedTuple):
+    """日付文字列の解析結果"""
+    is_valid: bool
+    relative_info: str
+    parsed_date: Optional[datetime] = None
+    days_diff: Optional[int] = None
+    is_future: bool = False
+    is_recent: bool = False
+
+    def get(self, key: str, default=None):
+        """辞書と同じ形式で値を取得（従来の呼び出し側との互換性のため）"""
+        return getattr(self, key, default)
+
 class Config:
     """設定管理クラス"""
 
     def __init__(self, config_path: str = "config.yaml"):
         self.config_path = config_path
         self.config = self._load_config()
+        # ドット区切りキーで直接引けるように平坦化しておく
+        self._flat_config = self._flatten_config(self.config)
 
     def _load_config(self) -> Dict:
         """設定ファイルを読み込み"""
         if os.path.exists(self.config_path):
-            with open(self.config_path, 'r', encoding='utf-8') as f:
-                config = yaml.safe_load(f)
-                # 環境変数を展開
-                self._expand_env_vars(config)
-                return config
+            # 解析・環境変数の展開済みの辞書はConfig間で共有されるため、書き換えないこと
+            return _read_config_file(self.config_path, os.path.getmtime(self.config_path))
         else:
             # デフォルト設定
             default_config = {
                 'language_model': {
                     'default': 'ollama',
-                    'ollama': {'model_name': 'llama2', 'base_url': 'http://localhost:11434'},
-                    'openai': {'model': 'gpt-3.5-turbo', 'max_tokens': 2000, 'temperature': 0.7},
-                    'gemini': {'model': 'gemini-2.0-flash', 'temperature': 0.7}
+                    'ollama': {'model_name': 'llama2', 'base_url': 'http://localhost:11434',
+                               'max_prompt_chars': 0},
+                    'openai': {'model': 'gpt-3.5-turbo', 'max_tokens': 2000, 'temperature': 0.7,
+                               'max_prompt_chars': 12000},
+                    'gemini': {'model': 'gemini-2.0-flash', 'temperature': 0.7, 'max_prompt_chars': 0},
+                    'cache': {
+                        'enabled': True,
+                        'max_entries': 256,
+                        'disk': {
+                            'enabled': True,
+                            'path': '.cache/llm_responses.sqlite3',
+                            'ttl_seconds': 604800,
+                            'max_entries': 10000
+                        }
+                    }
                 },
                 'iteration': {
                     'max_iterations': 3,
                     'initial_search_count': 8,
                     'additional_search_count': 5,
-                    'max_additional_queries': 3
+                    'max_additional_queries': 3,
+                    'reanalysis_min_new_results': 5
                 },
                 'search': {
                     'engine': 'google',
                     'max_results': 5,
+                    'cache': {
+                        'disk': {
+                            'enabled': True,
+                            'path': '.cache/search_results.sqlite3',
+                            'ttl_seconds': 86400,
+                            'max_entries': 10000
+                        }
+                    },
                     'rate_limit': {
                         'requests_per_second': 8,
                         'max_retries': 3,
@@ -122,40 +284,46 @@ class Config:
             }
             return default_config
 
-    def _expand_env_vars(self, obj):
-        """辞書内の環境変数を展開"""
+    def _flatten_config(self, obj, prefix: str = "") -> Dict:
+        """ネストした設定を「a.b.c」形式のキーを持つ辞書に変換（途中の階層も含む）"""
+        flat = {}
         if isinstance(obj, dict):
             for key, value in obj.items():
-                if isinstance(value, str) and value.startswith('${') and value.endswith('}'):
-                    # ${VAR_NAME} 形式の環境変数を展開
-                    env_var = value[2:-1]  # ${} を除去
-                    expanded_value = os.getenv(env_var, value)
-                    if expanded_value != value:
-                        print(f"🔧 環境変数を展開: {env_var} = {expanded_value[:10]}...")
-                    else:
-                        print(f"⚠️  環境変数が見つかりません: {env_var}")
-                    obj[key] = expanded_value
-                elif isinstance(value, (dict, list)):
-                    self._expand_env_vars(value)
-        elif isinstance(obj, list):
-            for item in obj:
-                if isinstance(item, (dict, list)):
-                    self._expand_env_vars(item)
+                dotted_key = f"{prefix}{key}"
+                flat[dotted_key] = value
+                if isinstance(value, dict):
+                    flat.update(self._flatten_config(value, f"{dotted_key}."))
+        return flat
 
     def get(self, key: str, default=None):
         """設定値を取得"""
-        keys = key.split('.')
-        value = self.config
-        for k in keys:
-            if isinstance(value, dict) and k in value:
-                value = value[k]
-            else:
-                return default
-        return value
+        return self._flat_config.get(key, default)
+
+class StructuredResponseError(ValueError):
+    """構造化レスポンスを解析できなかった場合の例外（生成済みの応答テキストを呼び出し側で再利用できるよう保持）"""
+
+    def __init__(self, message: str, response_text: Optional[str] = None):
+        super().__init__(message)
+        self.response_text = response_text
 
 class LanguageModel:
     """言語モデルの抽象クラス"""
 
+    # generateがエラー時に返すメッセージの接頭辞（キャッシュ対象から除外するため）
+    error_prefix: Optional[str] = None
+
+    # 構造化プロンプト全体の最大文字数（0またはNoneなら制限しない）
+    max_prompt_chars: Optional[int] = None
+    # 省略後も残す依頼内容の最小文字数（これを確保できない上限では省略しない）
+    MIN_PROMPT_BODY_CHARS = 1000
+    # 構造化プロンプトの末尾（依頼内容の後に付ける回答欄）
+    STRUCTURED_PROMPT_TRAILER = "\n\nJSON回答:\n"
+
+    # JSONの有効なエスケープ（グループ1）と、それ以外の単独のバックスラッシュ
+    INVALID_ESCAPE_PATTERN = re.compile(r'(\\["\\/bfnrtu])|\\')
+    # JSONオブジェクトの範囲判定に必要なトークン（エスケープ・引用符・波括弧）
+    JSON_STRUCTURE_PATTERN = re.compile(r'\\.|["{}]', re.DOTALL)
+
     def generate(self, prompt: str) -> str:
         """プロンプトからテキストを生成"""
         raise NotImplementedError
@@ -175,102 +343,130 @@ class LanguageModel:
         except Exception as e:
             print(f"⚠️  構造化レスポンスの解析に失敗: {e}")
             print(f"   レスポンス: {response_text[:200]}...")
+            # 解析できなかった応答はキャッシュから除く（次回も同じ応答が再利用されないように）
+            self._discard_response(structured_prompt)
             # フォールバック: デフォルト値を返す
-            return self._create_fallback_response(response_model)
+            try:
+                return self._create_fallback_response(response_model)
+            except Exception:
+                # デフォルト値のないモデルは、応答を再生成せずに済むよう応答テキストを例外に持たせる
+                is_error = bool(self.error_prefix) and response_text.startswith(self.error_prefix)
+                raise StructuredResponseError(str(e), None if is_error else response_text) from e
+
+    def _discard_response(self, prompt: str):
+        """プロンプトに対する応答を破棄（キャッシュを持たないモデルでは何もしない）"""
+        pass
 
     def _create_structured_prompt(self, prompt: str, response_model: BaseModel) -> str:
         """構造化プロンプトを作成"""
-        schema = response_model.model_json_schema()
+        # スキーマ・回答例はレスポンスモデルごとに不変のため先頭に置き、可変の依頼内容は後ろに置く
+        # （プロバイダ側のプロンプトキャッシュが先頭一致で効くように）
+        header = self._structured_prompt_header(response_model)
+
+        # 長すぎる依頼は固定部分を残したまま中間を省略する（コンテキスト長と応答時間を抑える）
+        fixed_length = len(header) + len(self.STRUCTURED_PROMPT_TRAILER)
+        if self.max_prompt_chars and fixed_length + len(prompt) > self.max_prompt_chars:
+            budget = self.max_prompt_chars - fixed_length
+            if budget < self.MIN_PROMPT_BODY_CHARS:
+                # 固定部分だけで上限に近い場合、依頼内容がほぼ残らないため省略しない
+                print(f"⚠️  max_prompt_chars（{self.max_prompt_chars}文字）がスキーマ・回答例に対して小さすぎるため、"
+                      f"プロンプトを省略せずに送信します")
+            else:
+                original_length = len(prompt)
+                prompt = _truncate_middle(prompt, budget)
+                print(f"⚠️  プロンプトが長いため中間部分を省略しました: {original_length}文字 → {len(prompt)}文字")
 
-        structured_prompt = f"""
-{prompt}
+        return f"{header}{prompt}{self.STRUCTURED_PROMPT_TRAILER}"
 
-重要: 以下のJSONスキーマに従って、正確なJSON形式で回答してください。
+    @classmethod
+    @lru_cache(maxsize=None)
+    def _structured_prompt_header(cls, response_model: BaseModel) -> str:
+        """構造化プロンプトの固定部分（スキーマと回答例）を作成（レスポンスモデルごとに1回だけ生成）"""
+        schema = response_model.model_json_schema()
+        return f"""
+重要: 以下の依頼には、次のJSONスキーマに従って正確なJSON形式で回答してください。
 番号や記号、説明文は含めず、純粋なJSONのみを返してください。
 
 JSONスキーマ:
-{json.dumps(schema, ensure_ascii=False, indent=2)}
+{_json_dumps(schema, indent=True)}
 
 回答例:
-{self._generate_example_response(response_model)}
+{cls._generate_example_response(response_model)}
 
-JSON回答:
+===== 依頼 =====
 """
-        return structured_prompt
 
-    def _generate_example_response(self, response_model: BaseModel) -> str:
+    @staticmethod
+    def _generate_example_response(response_model: BaseModel) -> str:
         """レスポンスモデルの例を生成"""
         if response_model == AdditionalQueriesResponse:
-            return json.dumps({
+            return _json_dumps({
                 "keywords": ["市場規模 統計", "AI規制 法律", "倫理ガイドライン", "雇用影響 調査", "医療AI 応用"]
-            }, ensure_ascii=False, indent=2)
+            }, indent=True)
         elif response_model == AnalysisResponse:
-            return json.dumps({
+            return _json_dumps({
                 "main_facts": ["2024年にAI技術が大幅に進歩した", "大規模言語モデルの性能が向上した"],
                 "data_statistics": ["市場規模は前年比30%増加", "企業導入率は60%に達した"],
                 "different_perspectives": ["技術的進歩を評価する意見", "雇用への影響を懸念する意見"],
                 "date_analysis": ["2024年の情報は最新", "2023年のデータは過去の情報"],
                 "unknown_points": ["具体的な規制内容", "長期的な影響の詳細"]
-            }, ensure_ascii=False, indent=2)
+            }, indent=True)
         elif response_model == SummaryResponse:
-            return json.dumps({
+            return _json_dumps({
                 "key_facts": ["AI技術が2024年に大幅進歩", "企業導入が加速", "規制議論が活発化"],
                 "conclusion": "AI技術は急速に発展しているが、規制や倫理面での課題も存在する",
                 "date_summary": "2024年の最新情報を中心に構成"
-            }, ensure_ascii=False, indent=2)
+            }, indent=True)
         else:
             return "{}"
 
     def _extract_json_from_response(self, response_text: str) -> dict:
         """レスポンステキストからJSONを抽出"""
-        # JSONブロックを探す
+        # 最初のJSONオブジェクトの範囲を探す
         json_start = response_text.find('{')
-        json_end = response_text.rfind('}') + 1
+        json_end = self._find_json_object_end(response_text, json_start) if json_start != -1 else -1
 
-        if json_start == -1 or json_end == 0:
+        if json_end == -1:
             raise ValueError("JSONが見つかりません")
 
         json_str = response_text[json_start:json_end]
 
-        # 複数のJSONブロックがある場合は最後のものを使用
-        if json_str.count('{') > 1:
-            # ネストされたJSONを処理
-            brace_count = 0
-            start_pos = -1
-            for i, char in enumerate(json_str):
-                if char == '{':
-                    if brace_count == 0:
-                        start_pos = i
-                    brace_count += 1
-                elif char == '}':
-                    brace_count -= 1
-                    if brace_count == 0 and start_pos != -1:
-                        json_str = json_str[start_pos:i+1]
-                        break
-
-        # JSONエスケープ文字を適切に処理
         try:
-            # まず通常のJSONパースを試行
-            return json.loads(json_str)
-        except json.JSONDecodeError as e:
-            # エスケープ文字の問題がある場合、手動で修正
-            if "Invalid \\escape" in str(e):
-                # 一般的なエスケープ文字を修正
-                json_str = json_str.replace('\\n', '\\\\n')
-                json_str = json_str.replace('\\"', '\\\\"')
-                json_str = json_str.replace('\\t', '\\\\t')
-                json_str = json_str.replace('\\r', '\\\\r')
-
-                try:
-                    return json.loads(json_str)
-                except json.JSONDecodeError:
-                    # それでも失敗する場合は、より積極的な修正
-                    import re
-                    # バックスラッシュを適切にエスケープ
-                    json_str = re.sub(r'\\(?!["\\/bfnrt])', r'\\\\', json_str)
-                    return json.loads(json_str)
+            return _json_loads(json_str)
+        except ValueError:
+            # 不正なエスケープ文字がある場合はバックスラッシュをエスケープして再試行
+            fixed_json_str = self.INVALID_ESCAPE_PATTERN.sub(self._escape_backslash, json_str)
+            if fixed_json_str == json_str:
+                raise
+            return _json_loads(fixed_json_str)
+
+    @classmethod
+    def _find_json_object_end(cls, text: str, start: int) -> int:
+        """startの '{' に対応する '}' の直後の位置を返す（文字列中の括弧は数えない）"""
+        depth = 0
+        in_string = False
+        # 括弧・引用符・エスケープのみを正規表現で拾い、それ以外の文字はまとめて読み飛ばす
+        for match in cls.JSON_STRUCTURE_PATTERN.finditer(text, start):
+            token = match.group()
+            if token == '"':
+                in_string = not in_string
+            elif in_string or token[0] == '\\':
+                continue
+            elif token == '{':
+                depth += 1
             else:
-                raise e
+                depth -= 1
+                if depth == 0:
+                    return match.end()
+
+        # 括弧が閉じていない場合は最後の '}' までを対象にする
+        last_brace = text.rfind('}')
+        return last_brace + 1 if last_brace > start else -1
+
+    @staticmethod
+    def _escape_backslash(match: "re.Match") -> str:
+        """有効なエスケープはそのまま残し、単独のバックスラッシュをエスケープ"""
+        return match.group(1) or '\\\\'
 
     def _create_fallback_response(self, response_model: BaseModel) -> BaseModel:
         """フォールバック用のデフォルトレスポンスを作成"""
@@ -289,26 +485,43 @@ JSON回答:
 class OllamaModel(LanguageModel):
     """Ollamaローカルモデル"""
 
+    error_prefix = "Ollama API "
+
     def __init__(self, config: Config):
         self.model_name = config.get('language_model.ollama.model_name', 'llama2')
         self.base_url = config.get('language_model.ollama.base_url', 'http://localhost:11434')
+        self.max_prompt_chars = config.get('language_model.ollama.max_prompt_chars', 0)
+        self.session = _create_http_session()
 
     def generate(self, prompt: str) -> str:
         """Ollama APIを使用してテキスト生成"""
         try:
-            response = requests.post(
+            # ストリーミングで受信し、チャンク単位でタイムアウトを判定する
+            with self.session.post(
                 f"{self.base_url}/api/generate",
                 json={
                     "model": self.model_name,
                     "prompt": prompt,
-                    "stream": False
+                    "stream": True
                 },
-                timeout=60  # タイムアウトを60秒に設定
-            )
-            response.raise_for_status()
-            return response.json()["response"]
+                stream=True,
+                timeout=(5, 60)  # 接続5秒、チャンク間の待機60秒
+            ) as response:
+                response.raise_for_status()
+                parts = []
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    chunk = _json_loads(line)
+                    if "error" in chunk:
+                        return f"Ollama API エラー: {chunk['error']}"
+                    parts.append(chunk.get("response", ""))
+                    if chunk.get("done"):
+                        return "".join(parts)
+                # 完了通知（"done": true）がないまま終わった途中までの応答は返さない（キャッシュもされない）
+                return f"Ollama API エラー: 応答が完了前に途切れました（{len(parts)}チャンク受信）"
         except requests.exceptions.Timeout:
-            return f"Ollama API タイムアウト: モデル {self.model_name} の応答が60秒を超えました"
+            return f"Ollama API タイムアウト: モデル {self.model_name} の応答が60秒以上途絶えました"
         except requests.exceptions.ConnectionError:
             return f"Ollama API 接続エラー: {self.base_url} に接続できません。Ollamaが起動しているか確認してください"
         except requests.exceptions.RequestException as e:
@@ -319,22 +532,30 @@ class OllamaModel(LanguageModel):
 class OpenAIModel(LanguageModel):
     """OpenAI APIモデル"""
 
+    error_prefix = "OpenAI API エラー"
+
     def __init__(self, config: Config):
         self.api_key = os.getenv("OPENAI_API_KEY")
         self.model = config.get('language_model.openai.model', 'gpt-3.5-turbo')
         self.max_tokens = config.get('language_model.openai.max_tokens', 2000)
         self.temperature = config.get('language_model.openai.temperature', 0.7)
+        self.max_prompt_chars = config.get('language_model.openai.max_prompt_chars', 12000)
+        self._client = None
 
         if not self.api_key:
             raise ValueError("OpenAI API キーが必要です")
 
+    def _get_client(self):
+        """APIクライアントを取得（初回のみ作成し、接続を使い回す）"""
+        if self._client is None:
+            import openai
+            self._client = openai.OpenAI(api_key=self.api_key)
+        return self._client
+
     def generate(self, prompt: str) -> str:
         """OpenAI APIを使用してテキスト生成"""
         try:
-            import openai
-            client = openai.OpenAI(api_key=self.api_key)
-
-            response = client.chat.completions.create(
+            response = self._get_client().chat.completions.create(
                 model=self.model,
                 messages=[{"role": "user", "content": prompt}],
                 max_tokens=self.max_tokens,
@@ -347,33 +568,353 @@ class OpenAIModel(LanguageModel):
 class GoogleGeminiModel(LanguageModel):
     """Google Gemini APIモデル"""
 
+    error_prefix = "Google Gemini API エラー"
+
     def __init__(self, config: Config):
         self.api_key = os.getenv("GOOGLE_API_KEY")
         self.model = config.get('language_model.gemini.model', 'gemini-2.0-flash')
         self.temperature = config.get('language_model.gemini.temperature', 0.7)
+        self.max_prompt_chars = config.get('language_model.gemini.max_prompt_chars', 0)
+        self._client = None
 
         if not self.api_key:
             raise ValueError("Google API キーが必要です")
 
+    def _get_client(self):
+        """モデルクライアントを取得（初回のみ作成して使い回す）"""
+        if self._client is None:
+            import google.generativeai as genai
+            genai.configure(api_key=self.api_key)
+            self._client = genai.GenerativeModel(self.model)
+        return self._client
+
     def generate(self, prompt: str) -> str:
         """Google Gemini APIを使用してテキスト生成"""
         try:
-            import google.generativeai as genai
-            genai.configure(api_key=self.api_key)
-            model = genai.GenerativeModel(self.model)
-            response = model.generate_content(prompt)
+            response = self._get_client().generate_content(prompt)
             return response.text
         except Exception as e:
             return f"Google Gemini API エラー: {e}"
 
+class ResponseDiskCache:
+    """言語モデル応答・検索結果などテキストの永続キャッシュ（SQLite）"""
+
+    def __init__(self, path: str, ttl_seconds: int = 7 * 24 * 3600, max_entries: int = 10000):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, response TEXT NOT NULL, created_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+        self._prune()
+
+    def _prune(self):
+        """期限切れの応答と、上限件数を超えた古い応答を削除（起動時に1回だけ行う）"""
+        try:
+            with self._lock:
+                if self.ttl_seconds:
+                    self._conn.execute(
+                        "DELETE FROM responses WHERE created_at < ?", (time.time() - self.ttl_seconds,)
+                    )
+                if self.max_entries:
+                    self._conn.execute(
+                        "DELETE FROM responses WHERE key NOT IN "
+                        "(SELECT key FROM responses ORDER BY created_at DESC LIMIT ?)",
+                        (self.max_entries,)
+                    )
+                self._conn.commit()
+        except sqlite3.Error as e:
+            print(f"⚠️  応答キャッシュの整理に失敗: {e}")
+
+    def get(self, key: str) -> Optional[str]:
+        """キャッシュ済みの応答を取得（期限切れ・未登録の場合はNone）"""
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT response, created_at FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+        except sqlite3.Error as e:
+            print(f"⚠️  応答キャッシュの読み込みに失敗: {e}")
+            return None
+
+        if row is None:
+            return None
+        response, created_at = row
+        if self.ttl_seconds and time.time() - created_at > self.ttl_seconds:
+            return None
+        return response
+
+    def set(self, key: str, response: str):
+        """応答をキャッシュに保存"""
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, response, created_at) VALUES (?, ?, ?)",
+                    (key, response, time.time())
+                )
+                self._conn.commit()
+        except sqlite3.Error as e:
+            print(f"⚠️  応答キャッシュの保存に失敗: {e}")
+
+    def delete(self, key: str):
+        """キャッシュ済みの応答を削除"""
+        try:
+            with self._lock:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+        except sqlite3.Error as e:
+            print(f"⚠️  応答キャッシュの削除に失敗: {e}")
+
+    def clear(self):
+        """保存されている全ての応答を削除"""
+        try:
+            with self._lock:
+                self._conn.execute("DELETE FROM responses")
+                self._conn.commit()
+        except sqlite3.Error as e:
+            print(f"⚠️  応答キャッシュの削除に失敗: {e}")
+
+class CachedLanguageModel(LanguageModel):
+    """応答キャッシュ付き言語モデル（他のLanguageModelをラップする）
+
+    メモリ上のLRUキャッシュを1次キャッシュ、ResponseDiskCacheを2次キャッシュとして使用する。
+    """
+
+    def __init__(self, model: LanguageModel, max_entries: int = 256,
+                 disk_cache: Optional[ResponseDiskCache] = None):
+        self.model = model
+        self.max_entries = max_entries
+        self.disk_cache = disk_cache
+        self.cache: "OrderedDict[bytes, str]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __getattr__(self, name):
+        # model_name や base_url などはラップしたモデルの属性を返す
+        if name == "model":
+            raise AttributeError(name)
+        return getattr(self.model, name)
+
+    @property
+    def max_prompt_chars(self) -> Optional[int]:
+        """プロンプトの上限はラップしたモデルの設定に従う"""
+        return self.model.max_prompt_chars
+
+    @property
+    def error_prefix(self) -> Optional[str]:
+        """エラー応答の接頭辞はラップしたモデルのものを返す"""
+        return self.model.error_prefix
+
+    def generate(self, prompt: str) -> str:
+        """キャッシュを確認し、なければラップしたモデルで生成"""
+        key = self._cache_key(prompt)
+        with self._cache_lock:
+            response = self.cache.get(key)
+            if response is not None:
+                self.cache.move_to_end(key)
+                self.hits += 1
+        if response is not None:
+            print("📋 キャッシュから応答を取得")
+            return response
+
+        disk_key = key.hex() if self.disk_cache else None
+        if disk_key:
+            response = self.disk_cache.get(disk_key)
+            if response is not None:
+                self.hits += 1
+                print("📋 永続キャッシュから応答を取得")
+                self._store(key, response)
+                return response
+
+        self.misses += 1
+        response = self.model.generate(prompt)
+
+        # エラーメッセージはキャッシュしない
+        error_prefix = self.model.error_prefix
+        if error_prefix and response.startswith(error_prefix):
+            return response
+
+        self._store(key, response)
+        if disk_key:
+            self.disk_cache.set(disk_key, response)
+        return response
+
+    def _discard_response(self, prompt: str):
+        """キャッシュした応答を削除（構造化レスポンスとして解析できなかった場合）"""
+        key = self._cache_key(prompt)
+        with self._cache_lock:
+            self.cache.pop(key, None)
+        if self.disk_cache:
+            self.disk_cache.delete(key.hex())
+
+    def _store(self, key: bytes, response: str):
+        """メモリ上のキャッシュに保存（上限を超えたら最も古いものを削除）"""
+        with self._cache_lock:
+            self.cache[key] = response
+            self.cache.move_to_end(key)
+            if len(self.cache) > self.max_entries:
+                self.cache.popitem(last=False)
+
+    def _cache_key(self, prompt: str) -> bytes:
+        """モデル識別子と正規化したプロンプトからキャッシュキー（SHA-256ダイジェスト）を作成"""
+        model_id = getattr(self.model, 'model_name', None) or getattr(self.model, 'model', '')
+        temperature = getattr(self.model, 'temperature', '')
+        # 空白・改行の違いだけのプロンプトは同一とみなす
+        normalized_prompt = " ".join(prompt.split())
+        # 長いプロンプト全体をキーとして保持せず、32バイトのダイジェストにする（永続キャッシュのキーはその16進表記）
+        key = f"{type(self.model).__name__}|{model_id}|{temperature}|{normalized_prompt}"
+        return hashlib.sha256(key.encode('utf-8')).digest()
+
+class TTLCache:
+    """件数上限と有効期限付きのLRUキャッシュ（スレッド間で共有可能）"""
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 6 * 3600):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()  # キー → (値, 期限)
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        """値を取得（未登録・期限切れの場合はNone）"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at is not None and time.monotonic() >= expires_at:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value):
+        """値を保存（上限を超えたら最も古いものを削除）"""
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds else None
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """全ての値を削除"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+class SearchResultCache:
+    """検索結果のキャッシュ（メモリ上のTTLCacheを1次、ResponseDiskCacheを2次キャッシュとして使用）"""
+
+    def __init__(self, namespace: str, max_entries: int = 1024, ttl_seconds: float = 6 * 3600,
+                 disk_cache: Optional[ResponseDiskCache] = None):
+        self.namespace = namespace  # 検索エンジン名（永続キャッシュはエンジン間で共有するため区別する）
+        self.memory = TTLCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+        self.disk_cache = disk_cache
+
+    def get(self, key: str) -> Optional[List[SearchResult]]:
+        """検索結果を取得（未登録・期限切れの場合はNone）"""
+        results = self.memory.get(key)
+        if results is not None or self.disk_cache is None:
+            return results
+
+        data = self.disk_cache.get(self._disk_key(key))
+        if data is None:
+            return None
+        try:
+            results = [SearchResult(**item) for item in _json_loads(data)]
+        except (TypeError, ValueError) as e:
+            print(f"⚠️  検索キャッシュの読み込みに失敗: {e}")
+            return None
+        self.memory.set(key, results)
+        return results
+
+    def set(self, key: str, results: List[SearchResult]):
+        """検索結果を保存"""
+        self.memory.set(key, results)
+        if self.disk_cache is not None:
+            data = _json_dumps([asdict(result) for result in results])
+            self.disk_cache.set(self._disk_key(key), data)
+
+    def clear(self):
+        """キャッシュを削除（永続キャッシュは全検索エンジン分を削除）"""
+        self.memory.clear()
+        if self.disk_cache is not None:
+            self.disk_cache.clear()
+
+    def _disk_key(self, key: str) -> str:
+        return hashlib.sha256(f"{self.namespace}|{key}".encode('utf-8')).hexdigest()
+
+def _search_cache_key(query: str, num_results: int) -> str:
+    """表記ゆれ（全角・半角、大文字・小文字、空白）を吸収した検索キャッシュのキー"""
+    # 引用符（完全一致検索）などの記号は検索結果を変えるため、キーから取り除かない
+    normalized = unicodedata.normalize('NFKC', query).lower()
+    return f"{' '.join(normalized.split())}|{num_results}"
+
+class TokenBucket:
+    """トークンバケット方式のレート制限（スレッド間で共有可能）"""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate  # 1秒あたりに補充されるトークン数
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self.tokens = self.capacity
+        self.last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """トークンを1つ予約し、送信までに待つべき秒数を返す（0なら即時送信可）"""
+        with self._lock:
+            self._refill()
+            # 不足分も先に予約しておき、同時に待つ呼び出し同士が同じ枠を取り合わないようにする
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+    def decrease(self, factor: float, min_rate: float):
+        """補充レートを倍率で下げる（レート制限の応答を受けたとき）"""
+        with self._lock:
+            self._refill()
+            self.rate = max(min_rate, self.rate * factor)
+
+    def increase(self, step: float, max_rate: float):
+        """補充レートを一定量ずつ上げる（リクエストが成功したとき）"""
+        with self._lock:
+            self._refill()
+            self.rate = min(max_rate, self.rate + step)
+
+    def _refill(self):
+        """経過時間分のトークンを現在のレートで補充（ロックを取得した状態で呼ぶ）"""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate)
+        self.last_refill = now
+
 class DuckDuckGoSearcher:
     """DuckDuckGo検索エンジン"""
 
-    def __init__(self, rate_limit: int = 2, max_retries: int = 3):
+    # クエリ簡略化で削除する年・月・日の表記（この順に適用）
+    QUERY_DATE_PATTERNS = (
+        re.compile(r'\d{4}年'),
+        re.compile(r'\d{1,2}月'),
+        re.compile(r'\d{1,2}日'),
+    )
+
+    def __init__(self, rate_limit: int = 2, max_retries: int = 3,
+                 cache: Optional[SearchResultCache] = None):
         self.rate_limit = rate_limit  # 秒間リクエスト数
         self.max_retries = max_retries
-        self.last_request_time = 0
-        self.session = requests.Session()
+        self._rate_limiter = TokenBucket(rate_limit)
+        self.cache = cache if cache is not None else SearchResultCache("duckduckgo")
+        self.session = _create_http_session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         })
@@ -382,6 +923,13 @@ class DuckDuckGoSearcher:
         """DuckDuckGoで検索を実行"""
         print(f"🔍 DuckDuckGo検索実行: {query}")
 
+        # キャッシュをチェック
+        cache_key = _search_cache_key(query, num_results)
+        cached_results = self.cache.get(cache_key)
+        if cached_results is not None:
+            print(f"📋 キャッシュから結果を取得: {query}")
+            return cached_results
+
         # レート制限を適用
         self._apply_rate_limit()
 
@@ -398,7 +946,7 @@ class DuckDuckGoSearcher:
             response = self.session.get(url, params=params, timeout=30)
             response.raise_for_status()
 
-            data = response.json()
+            data = _json_loads(response.content)
             results = []
 
             # Instant Answerから結果を抽出
@@ -437,8 +985,12 @@ class DuckDuckGoSearcher:
                     simplified_results = self._search_simplified(simplified_query, num_results - len(results))
                     results.extend(simplified_results)
 
+            results = results[:num_results]
+            if results:
+                self.cache.set(cache_key, results)
+
             print(f"✅ DuckDuckGo検索完了: {len(results)}件の結果")
-            return results[:num_results]
+            return results
 
         except Exception as e:
             print(f"❌ DuckDuckGo検索エラー: {e}")
@@ -447,23 +999,12 @@ class DuckDuckGoSearcher:
     def _simplify_query(self, query: str) -> str:
         """クエリを簡略化"""
         # 年号や具体的な日付を削除
-        import re
-        simplified = re.sub(r'\d{4}年', '', query)
-        simplified = re.sub(r'\d{1,2}月', '', simplified)
-        simplified = re.sub(r'\d{1,2}日', '', simplified)
-
-        # 複数の空白を単一の空白に
-        simplified = re.sub(r'\s+', ' ', simplified)
-
-        # 先頭と末尾の空白を削除
-        simplified = simplified.strip()
+        simplified = query
+        for pattern in self.QUERY_DATE_PATTERNS:
+            simplified = pattern.sub('', simplified)
 
-        # 3単語以上の場合、最初の3単語のみを使用
-        words = simplified.split()
-        if len(words) > 3:
-            simplified = ' '.join(words[:3])
-
-        return simplified
+        # 空白で区切り、3単語以上の場合は最初の3単語のみを使用（連続した空白・前後の空白もここで除去される）
+        return ' '.join(simplified.split()[:3])
 
     def _search_simplified(self, simplified_query: str, num_results: int) -> List[SearchResult]:
         """簡略化されたクエリで検索"""
@@ -485,7 +1026,14 @@ class DuckDuckGoSearcher:
             response = self.session.post(url, data=params, timeout=30)
             response.raise_for_status()
 
-            soup = BeautifulSoup(response.text, 'html.parser')
+            # HTMLの解析はフォールバック時のみ必要なため、起動時には読み込まない
+            from bs4 import BeautifulSoup, FeatureNotFound, SoupStrainer
+            # 検索結果の要素だけを木に構築し、C実装のlxmlパーサーがあれば使用する
+            only_results = SoupStrainer(class_=self._is_result_class)
+            try:
+                soup = BeautifulSoup(response.text, 'lxml', parse_only=only_results)
+            except FeatureNotFound:
+                soup = BeautifulSoup(response.text, 'html.parser', parse_only=only_results)
             results = []
 
             # 検索結果を抽出
@@ -518,29 +1066,83 @@ class DuckDuckGoSearcher:
             print(f"❌ DuckDuckGo HTML検索エラー: {e}")
             return []
 
-    def _apply_rate_limit(self):
-        """レート制限を適用"""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
-        min_interval = 1.0 / self.rate_limit
-
-        if time_since_last < min_interval:
-            sleep_time = min_interval - time_since_last
-            time.sleep(sleep_time)
+    @staticmethod
+    def _is_result_class(class_value: Optional[str]) -> bool:
+        """class属性に 'result' を含むか（'result__title' などは対象外）"""
+        return class_value is not None and 'result' in class_value.split()
 
-        self.last_request_time = time.time()
+    def _apply_rate_limit(self):
+        """レート制限を適用（トークンが足りない場合のみ待機）"""
+        wait_time = self._rate_limiter.acquire()
+        if wait_time > 0:
+            time.sleep(wait_time)
 
 class WebSearcher:
     """Web検索エンジン（Google Custom Search API）"""
 
-    def __init__(self, api_key: str, search_engine_id: str, rate_limit: int = 2, max_retries: int = 5):
+    # 429応答時にレートを下げる倍率、成功時に戻す幅（req/sec）、レートの下限
+    RATE_DECREASE_FACTOR = 0.5
+    RATE_INCREASE_STEP = 0.5
+    MIN_RATE = 0.5
+
+    # 信頼性スコアの加算対象（ドメインパターン, 加算値）
+    RELIABILITY_DOMAIN_PATTERNS = (
+        # 公式サイトや信頼できるドメイン
+        (_compile_substring_pattern([
+            'aig.co.jp', 'aig.com', 'travel.aig.co.jp',
+            'jata-net.or.jp', 'sompo-japan.co.jp',
+            'tokyomarine-nichido.co.jp', 'ms-ins.com',
+            'sonpo.co.jp', 'aioinissaydowa.co.jp'
+        ]), 0.3),
+        # ニュースサイト
+        (_compile_substring_pattern([
+            'reuters.com', 'bloomberg.com', 'nikkei.com',
+            'asahi.com', 'mainichi.jp', 'yomiuri.co.jp'
+        ]), 0.2),
+        # 政府・公的機関
+        (_compile_substring_pattern([
+            'go.jp', 'meti.go.jp', 'mlit.go.jp',
+            'fsa.go.jp', 'jata-net.or.jp'
+        ]), 0.4),
+    )
+
+    # 日付情報を含むメタデータのフィールド（優先順）
+    DATE_META_FIELDS = (
+        'article:published_time',
+        'article:modified_time',
+        'og:updated_time',
+        'lastmod',
+        'date',
+        'pubdate'
+    )
+
+    # スニペット内の日付パターン（全形式を1つの正規表現にまとめて1回で走査）
+    SNIPPET_DATE_PATTERN = re.compile('|'.join([
+        r'\d{4}年\d{1,2}月\d{1,2}日',
+        r'\d{4}/\d{1,2}/\d{1,2}',
+        r'\d{4}-\d{1,2}-\d{1,2}',
+        r'\d{1,2}/\d{1,2}/\d{4}'
+    ]))
+
+    # ソースタイプの判定（ドメインパターン, ソースタイプ）。先に一致したものを採用
+    SOURCE_TYPE_PATTERNS = (
+        (_compile_substring_pattern(['aig.co.jp', 'aig.com']), "official"),
+        (_compile_substring_pattern(['reuters.com', 'bloomberg.com', 'nikkei.com']), "news"),
+        (_compile_substring_pattern(['go.jp', 'meti.go.jp']), "government"),
+        (_compile_substring_pattern(['jata-net.or.jp', 'sompo-japan.co.jp']), "industry"),
+    )
+
+    def __init__(self, api_key: str, search_engine_id: str, rate_limit: int = 2, max_retries: int = 5,
+                 cache: Optional[SearchResultCache] = None):
         self.api_key = api_key
         self.search_engine_id = search_engine_id
         self.rate_limit = rate_limit
         self.max_retries = max_retries
-        self.last_request_time = 0
-        self.cache = {}
-        self.session = requests.Session()
+        self._rate_limiter = TokenBucket(rate_limit)
+        self.cache = cache if cache is not None else SearchResultCache("google")
+        # ドメインごとの（信頼性スコア, ソースタイプ）。同じドメインは反復をまたいで何度も現れる
+        self._domain_profiles: Dict[str, tuple] = {}
+        self.session = _create_http_session()
 
         print(f"🔧 WebSearcher初期化:")
         print(f"   APIキー: {'設定済み' if api_key else '未設定'}")
@@ -552,15 +1154,16 @@ class WebSearcher:
         print(f"🔍 Google検索実行: {query}")
 
         # キャッシュをチェック
-        cache_key = f"{query}_{num_results}"
-        if cache_key in self.cache:
+        cache_key = _search_cache_key(query, num_results)
+        cached_results = self.cache.get(cache_key)
+        if cached_results is not None:
             print(f"📋 キャッシュから結果を取得: {query}")
-            return self.cache[cache_key]
-
-        # レート制限を適用
-        self._apply_rate_limit()
+            return cached_results
 
         for attempt in range(self.max_retries):
+            # レート制限を適用（リトライも現在のレートに従う）
+            self._apply_rate_limit()
+
             try:
                 url = "https://www.googleapis.com/customsearch/v1"
                 params = {
@@ -572,12 +1175,16 @@ class WebSearcher:
                     'sort': 'date'  # 日付順
                 }
 
-                response = self.session.get(url, params=params, timeout=30)
+                response = self.session.get(url, params=params, timeout=(5, 30))  # 接続5秒、応答30秒
 
                 if response.status_code == 429:
                     print(f"⚠️  APIレート制限に達しました（試行 {attempt + 1}/{self.max_retries}）")
+                    # 以降のリクエスト間隔を広げる（AIMD: 制限時は倍率で減らし、成功時に少しずつ戻す）
+                    self._rate_limiter.decrease(self.RATE_DECREASE_FACTOR, self.MIN_RATE)
                     if attempt < self.max_retries - 1:
-                        wait_time = (2 ** attempt) + random.uniform(0, 1)
+                        wait_time = self._get_retry_after(response)
+                        if wait_time is None:
+                            wait_time = (2 ** attempt) + random.uniform(0, 1)
                         print(f"   {wait_time:.1f}秒待機中...")
                         time.sleep(wait_time)
                         continue
@@ -586,18 +1193,18 @@ class WebSearcher:
                         return []
 
                 response.raise_for_status()
-                data = response.json()
+                self._rate_limiter.increase(self.RATE_INCREASE_STEP, self.rate_limit)
+                data = _json_loads(response.content)
 
-                results = []
-                for item in data.get('items', []):
-                    # 日付情報を抽出
-                    date_info = self._extract_date_info(item)
+                items = data.get('items', [])
 
-                    # 信頼性スコアを計算
-                    reliability_score = self._calculate_reliability_score(item)
+                # 日付情報をまとめて抽出
+                date_infos = self._extract_date_infos(items)
 
-                    # ソースタイプを判定
-                    source_type = self._determine_source_type(item.get('displayLink', ''))
+                results = []
+                for item, date_info in zip(items, date_infos):
+                    # 信頼性スコアとソースタイプを判定
+                    reliability_score, source_type = self._get_domain_profile(item.get('displayLink', ''))
 
                     results.append(SearchResult(
                         title=item.get('title', ''),
@@ -609,8 +1216,9 @@ class WebSearcher:
                         source_type=source_type
                     ))
 
-                # 結果をキャッシュ
-                self.cache[cache_key] = results
+                # 結果をキャッシュ（一時的な障害で空になった結果は保存しない）
+                if results:
+                    self.cache.set(cache_key, results)
 
                 print(f"✅ Google検索完了: {len(results)}件の結果")
                 return results
@@ -630,82 +1238,82 @@ class WebSearcher:
 
         return []
 
+    def _get_retry_after(self, response: requests.Response) -> Optional[float]:
+        """Retry-Afterヘッダーで指定された待機秒数を取得（指定がなければNone）"""
+        retry_after = response.headers.get('Retry-After')
+        if not retry_after:
+            return None
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            pass
+        try:
+            # HTTP日付形式（例: Wed, 21 Oct 2015 07:28:00 GMT）
+            retry_at = parsedate_to_datetime(retry_after)
+        except (TypeError, ValueError):
+            return None
+        return max(0.0, retry_at.timestamp() - time.time())
+
     def _extract_date_info(self, item: Dict) -> Optional[str]:
         """検索結果から日付情報を抽出"""
+        return self._extract_date_infos([item])[0]
+
+    def _extract_date_infos(self, items: List[Dict]) -> List[Optional[str]]:
+        """複数の検索結果から日付情報をまとめて抽出"""
         # メタデータから日付を探す
-        metatags = item.get('pagemap', {}).get('metatags', [{}])[0]
+        dates = [self._extract_meta_date(item) for item in items]
 
-        # 様々な日付フィールドをチェック
-        date_fields = [
-            'article:published_time',
-            'article:modified_time',
-            'og:updated_time',
-            'lastmod',
-            'date',
-            'pubdate'
-        ]
+        # メタデータにない検索結果はスニペットを連結し、1回の走査で日付パターンを探す
+        pending = [i for i, date in enumerate(dates) if date is None]
+        if not pending:
+            return dates
 
-        for field in date_fields:
-            if field in metatags:
-                return metatags[field]
+        snippets = [items[i].get('snippet', '') for i in pending]
+        starts = []
+        offset = 0
+        for snippet in snippets:
+            starts.append(offset)
+            offset += len(snippet) + 1  # 区切り文字の分
 
-        # スニペットから日付パターンを探す
-        snippet = item.get('snippet', '')
-        date_patterns = [
-            r'(\d{4}年\d{1,2}月\d{1,2}日)',
-            r'(\d{4}/\d{1,2}/\d{1,2})',
-            r'(\d{4}-\d{1,2}-\d{1,2})',
-            r'(\d{1,2}/\d{1,2}/\d{4})'
-        ]
+        for match in self.SNIPPET_DATE_PATTERN.finditer("\n".join(snippets)):
+            index = pending[bisect.bisect_right(starts, match.start()) - 1]
+            if dates[index] is None:  # 各スニペットで最初に現れた日付を採用
+                dates[index] = match.group(0)
 
-        for pattern in date_patterns:
-            match = re.search(pattern, snippet)
-            if match:
-                return match.group(1)
+        return dates
 
+    def _extract_meta_date(self, item: Dict) -> Optional[str]:
+        """検索結果のメタデータから日付情報を取得"""
+        metatags = item.get('pagemap', {}).get('metatags', [{}])[0]
+
+        # 様々な日付フィールドをチェック
+        for field in self.DATE_META_FIELDS:
+            if field in metatags:
+                return metatags[field]
         return None
 
+    def _get_domain_profile(self, display_link: str) -> tuple:
+        """ドメインの信頼性スコアとソースタイプを取得（ドメインごとにキャッシュ）"""
+        display_link = display_link.lower()
+        profile = self._domain_profiles.get(display_link)
+        if profile is None:
+            profile = (
+                self._calculate_reliability_score({'displayLink': display_link}),
+                self._determine_source_type(display_link)
+            )
+            self._domain_profiles[display_link] = profile
+        return profile
+
     def _calculate_reliability_score(self, item: Dict) -> float:
         """検索結果の信頼性スコアを計算"""
         score = 0.5  # ベーススコア
 
-        # ドメインの信頼性
+        # ドメインの信頼性（カテゴリごとに一致すれば加算）
         display_link = item.get('displayLink', '').lower()
 
-        # 公式サイトや信頼できるドメイン
-        trusted_domains = [
-            'aig.co.jp', 'aig.com', 'travel.aig.co.jp',
-            'jata-net.or.jp', 'sompo-japan.co.jp',
-            'tokyomarine-nichido.co.jp', 'ms-ins.com',
-            'sonpo.co.jp', 'aioinissaydowa.co.jp'
-        ]
-
-        for domain in trusted_domains:
-            if domain in display_link:
-                score += 0.3
-                break
-
-        # ニュースサイト
-        news_domains = [
-            'reuters.com', 'bloomberg.com', 'nikkei.com',
-            'asahi.com', 'mainichi.jp', 'yomiuri.co.jp'
-        ]
-
-        for domain in news_domains:
-            if domain in display_link:
-                score += 0.2
-                break
-
-        # 政府・公的機関
-        gov_domains = [
-            'go.jp', 'meti.go.jp', 'mlit.go.jp',
-            'fsa.go.jp', 'jata-net.or.jp'
-        ]
-
-        for domain in gov_domains:
-            if domain in display_link:
-                score += 0.4
-                break
+        for pattern, bonus in self.RELIABILITY_DOMAIN_PATTERNS:
+            if pattern.search(display_link):
+                score += bonus
 
         return min(score, 1.0)
 
@@ -713,34 +1321,23 @@ class WebSearcher:
         """ソースタイプを判定"""
         display_link = display_link.lower()
 
-        if any(domain in display_link for domain in ['aig.co.jp', 'aig.com']):
-            return "official"
-        elif any(domain in display_link for domain in ['reuters.com', 'bloomberg.com', 'nikkei.com']):
-            return "news"
-        elif any(domain in display_link for domain in ['go.jp', 'meti.go.jp']):
-            return "government"
-        elif any(domain in display_link for domain in ['jata-net.or.jp', 'sompo-japan.co.jp']):
-            return "industry"
-        else:
-            return "general"
+        for pattern, source_type in self.SOURCE_TYPE_PATTERNS:
+            if pattern.search(display_link):
+                return source_type
+        return "general"
 
     def _apply_rate_limit(self):
-        """レート制限を適用"""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
-        min_interval = 1.0 / self.rate_limit
-
-        if time_since_last < min_interval:
-            sleep_time = min_interval - time_since_last
-            time.sleep(sleep_time)
-
-        self.last_request_time = time.time()
+        """レート制限を適用（トークンが足りない場合のみ待機）"""
+        wait_time = self._rate_limiter.acquire()
+        if wait_time > 0:
+            time.sleep(wait_time)
 
 class HybridSearcher:
     """ハイブリッド検索エンジン（Google + DuckDuckGo）"""
 
     def __init__(self, google_api_key: str = None, google_search_engine_id: str = None,
-                 preferred_engine: str = "google", rate_limit: int = 2):
+                 preferred_engine: str = "google", rate_limit: int = 2,
+                 disk_cache: Optional[ResponseDiskCache] = None):
         self.google_searcher = None
         self.duckduckgo_searcher = None
         self.preferred_engine = preferred_engine.lower()
@@ -751,7 +1348,8 @@ class HybridSearcher:
             self.google_searcher = WebSearcher(
                 api_key=google_api_key,
                 search_engine_id=google_search_engine_id,
-                rate_limit=rate_limit
+                rate_limit=rate_limit,
+                cache=SearchResultCache("google", disk_cache=disk_cache)
             )
             print("✅ Google検索エンジンを初期化しました")
         else:
@@ -762,7 +1360,10 @@ class HybridSearcher:
                 print("   - GOOGLE_SEARCH_ENGINE_ID が設定されていません")
 
         # DuckDuckGo検索エンジンを初期化
-        self.duckduckgo_searcher = DuckDuckGoSearcher(rate_limit=rate_limit)
+        self.duckduckgo_searcher = DuckDuckGoSearcher(
+            rate_limit=rate_limit,
+            cache=SearchResultCache("duckduckgo", disk_cache=disk_cache)
+        )
         print("✅ DuckDuckGo検索エンジンを初期化しました")
 
         print(f"🔧 ハイブリッド検索エンジン初期化完了")
@@ -813,6 +1414,15 @@ class HybridSearcher:
             print(f"❌ 不明な検索エンジン: {engine}")
             return []
 
+    def search_many(self, queries: List[str], num_results: int = 10, force_engine: str = None) -> List[List[SearchResult]]:
+        """複数クエリを並行して検索し、クエリ順に結果を返す"""
+        if not queries:
+            return []
+        # 同時実行数はレート制限の1秒あたりのリクエスト数までに抑える（それ以上はトークン待ちになるだけ）
+        max_workers = max(1, min(len(queries), math.ceil(self.rate_limit)))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(lambda query: self.search(query, num_results, force_engine), queries))
+
     def get_available_engines(self) -> List[str]:
         """利用可能な検索エンジンのリストを取得"""
         engines = ["duckduckgo"]
@@ -832,23 +1442,20 @@ class CitationManager:
 
     def create_citations(self, search_results: List[SearchResult]) -> List[Citation]:
         """検索結果から引用を作成"""
-        citations = []
-        for result in search_results:
-            # 信頼性と関連度をチェック
-            if (result.reliability_score >= self.reliability_threshold and
-                result.reliability_score >= self.relevance_threshold):
-
-                citation = Citation(
-                    source_title=result.title,
-                    source_url=result.url,
-                    content=result.snippet,
-                    search_query=result.search_query,
-                    relevance_score=result.reliability_score,
-                    date_info=result.date_info
-                )
-                citations.append(citation)
-
-        return citations
+        # 信頼性と関連度のどちらの閾値も満たす（=大きい方の閾値以上の）結果のみを対象にする
+        min_score = max(self.reliability_threshold, self.relevance_threshold)
+        return [
+            Citation(
+                source_title=result.title,
+                source_url=result.url,
+                content=result.snippet,
+                search_query=result.search_query,
+                relevance_score=result.reliability_score,
+                date_info=result.date_info
+            )
+            for result in search_results
+            if result.reliability_score >= min_score
+        ]
 
     def add_citation(self, source: SearchResult, content: str, relevance_score: float = 1.0) -> int:
         """引用を追加"""
@@ -914,28 +1521,23 @@ class AnalysisResponse(BaseModel):
 
         if self.main_facts:
             text_parts.append("## 主要な事実")
-            for i, fact in enumerate(self.main_facts, 1):
-                text_parts.append(f"{i}. {fact}")
+            text_parts.extend(f"{i}. {item}" for i, item in enumerate(self.main_facts, 1))
 
         if self.data_statistics:
             text_parts.append("\n## 具体的なデータ・統計")
-            for i, stat in enumerate(self.data_statistics, 1):
-                text_parts.append(f"{i}. {stat}")
+            text_parts.extend(f"{i}. {item}" for i, item in enumerate(self.data_statistics, 1))
 
         if self.different_perspectives:
             text_parts.append("\n## 異なる視点・意見")
-            for i, perspective in enumerate(self.different_perspectives, 1):
-                text_parts.append(f"{i}. {perspective}")
+            text_parts.extend(f"{i}. {item}" for i, item in enumerate(self.different_perspectives, 1))
 
         if self.date_analysis:
             text_parts.append("\n## 日付分析")
-            for i, date_info in enumerate(self.date_analysis, 1):
-                text_parts.append(f"{i}. {date_info}")
+            text_parts.extend(f"{i}. {item}" for i, item in enumerate(self.date_analysis, 1))
 
         if self.unknown_points:
             text_parts.append("\n## 不明な点・追加調査が必要な項目")
-            for i, point in enumerate(self.unknown_points, 1):
-                text_parts.append(f"{i}. {point}")
+            text_parts.extend(f"{i}. {item}" for i, item in enumerate(self.unknown_points, 1))
 
         return "\n".join(text_parts) if text_parts else "分析結果が得られませんでした。"
 
@@ -962,8 +1564,7 @@ class SummaryResponse(BaseModel):
 
         if self.key_facts:
             text_parts.append("## 重要な事実")
-            for i, fact in enumerate(self.key_facts, 1):
-                text_parts.append(f"{i}. {fact}")
+            text_parts.extend(f"{i}. {item}" for i, item in enumerate(self.key_facts, 1))
 
         if self.conclusion:
             text_parts.append(f"\n## 結論\n{self.conclusion}")
@@ -987,21 +1588,103 @@ class FinalReportResponse(BaseModel):
 class DeepResearch:
     """Deep Researchのメインクラス（改善版）"""
 
-    def __init__(self, model_type: str = "ollama", search_engine: str = "auto"):
+    # フォールバック時に追加クエリから除外する行頭（番号・箇条書き記号）
+    QUERY_LIST_PREFIXES = ('1.', '2.', '3.', '4.', '5.', '-', '*', '•')
+
+    # 日付形式ごとの日時の組み立て（正規表現のグループ, 今日の日付）
+    DATE_INFO_BUILDERS = {
+        '%Y年%m月%d日': lambda g, today: datetime(int(g[0]), int(g[1]), int(g[2])),
+        '%Y-%m-%d': lambda g, today: datetime(int(g[0]), int(g[1]), int(g[2])),
+        '%Y/%m/%d': lambda g, today: datetime(int(g[0]), int(g[1]), int(g[2])),
+        '%m月%d日': lambda g, today: datetime(today.year, int(g[0]), int(g[1])),  # 今年の日付として扱う
+        '%Y年%m月': lambda g, today: datetime(int(g[0]), int(g[1]), 1),
+        '%Y年': lambda g, today: datetime(int(g[0]), 1, 1),
+    }
+
+    # 相対日付の単位（この日数未満なら適用, 1単位の日数, 過去の表現, 未来の表現）。上から順に判定
+    RELATIVE_DATE_UNITS = (
+        (7, 1, "%d日前", "%d日後"),
+        (30, 7, "%d週間前", "%d週間後"),
+        (365, 30, "%dヶ月前", "%dヶ月後"),
+        (None, 365, "%d年前", "%d年後"),
+    )
+
+    # 日付情報の解析前に数字の有無を確認するためのパターン
+    DIGIT_PATTERN = re.compile(r'\d')
+
+    # 日付情報の解析パターン（正規表現, 形式）。先に一致したものを採用
+    DATE_INFO_PATTERNS = tuple((re.compile(pattern), format_str) for pattern, format_str in (
+        (r'(\d{4})年(\d{1,2})月(\d{1,2})日', '%Y年%m月%d日'),
+        (r'(\d{4})-(\d{1,2})-(\d{1,2})', '%Y-%m-%d'),
+        (r'(\d{4})/(\d{1,2})/(\d{1,2})', '%Y/%m/%d'),
+        (r'(\d{1,2})月(\d{1,2})日', '%m月%d日'),
+        (r'(\d{4})年(\d{1,2})月', '%Y年%m月'),
+        (r'(\d{4})年', '%Y年'),
+    ))
+
+    # ファイル名のタイムスタンプ形式（設定値 → strftime形式）
+    TIMESTAMP_FORMATS = {
+        "YYYYMMDD_HHMMSS": "%Y%m%d_%H%M%S",
+        "YYYY-MM-DD_HH-MM-SS": "%Y-%m-%d_%H-%M-%S",
+    }
+
+    # 検索結果・引用文献1件分のマークダウンのテンプレート
+    SEARCH_RESULT_TEMPLATE = """
+#### {index}. [{title}]({url}){date_info}
+- **内容**: {snippet}
+- **信頼性: {reliability_score:.2f}（{source_type}）**
+
+"""
+    CITATION_TEMPLATE = """
+### [{index}] [{title}]({url}){date_info}
+- **検索クエリ**: {search_query}
+- **関連度**: {relevance_score:.2f}
+- **内容**: {content}
+
+"""
+
+    # 追加結果で再分析する最小の割合（reanalysis_min_new_results 件未満でも、全体に対してこれを超えれば再分析）
+    REANALYSIS_MIN_NEW_RATIO = 0.15
+
+    # 追加検索クエリとして無効な語（プロンプトの指示文がそのまま返された場合など）
+    INVALID_QUERY_PATTERN = _compile_substring_pattern([
+        'キーワード', '追加', '提案', '以下の', '各キーワード', '番号や記号',
+        '検索', 'クエリ', '生成', '作成', '分析', '要約'
+    ])
+
+    # レポート中の引用番号（[1] など。先頭が0の番号は引用番号とみなさない）
+    CITATION_REF_PATTERN = re.compile(r'\[([1-9][0-9]*)\]')
+
+    def __init__(self, model_type: str = "ollama", search_engine: str = "auto", use_cache: bool = True):
         """
         DeepResearchクラスの初期化
 
         Args:
             model_type: 使用する言語モデルのタイプ ("ollama", "openai", "gemini")
             search_engine: 使用する検索エンジン ("google", "duckduckgo", "auto")
+            use_cache: Falseの場合は永続キャッシュ（言語モデルの応答・検索結果）を使わない
         """
         self.config = Config()
+        self.use_cache = use_cache
         self.model_type = model_type
         self.search_engine = search_engine.lower()
-        self.today_date = datetime.now().strftime("%Y年%m月%d日")
+        now = datetime.now()
+        self.today_date = now.strftime("%Y年%m月%d日")
+        self.today_year, self.today_month, self.today_day = now.year, now.month, now.day
+        # 日付の相対表現の基準日（解析のたびに作り直さない）
+        self._today = datetime(self.today_year, self.today_month, self.today_day)
 
         # 設定ファイルから反復回数を読み込み
         self.max_iterations = self.config.get('iteration.max_iterations', 5)
+        self.reanalysis_min_new_results = self.config.get('iteration.reanalysis_min_new_results', 5)
+
+        # 言語モデル本体（タイプごとに1つ作成し、メインとレビュー用で共有）と永続応答キャッシュ
+        self._base_models: Dict[str, LanguageModel] = {}
+        self._response_disk_cache = None
+        if self.config.get('language_model.cache.enabled', True):
+            self._response_disk_cache = self._open_disk_cache(
+                'language_model.cache.disk', '.cache/llm_responses.sqlite3', 7 * 24 * 3600
+            )
 
         # 言語モデルを初期化
         self.model = self._create_model(self.model_type)
@@ -1024,11 +1707,14 @@ class DeepResearch:
             google_api_key=google_api_key,
             google_search_engine_id=google_search_engine_id,
             preferred_engine=preferred_engine,
-            rate_limit=rate_limit
+            rate_limit=rate_limit,
+            disk_cache=self._open_disk_cache('search.cache.disk', '.cache/search_results.sqlite3', 24 * 3600)
         )
 
         self.citation_manager = CitationManager(self.config)
         self.all_search_results: List[SearchResult] = []
+        # プロンプト用に整形済みの検索結果（検索結果, テキスト）
+        self._formatted_results: List[tuple] = []
 
         print(f"🔧 DeepResearch初期化完了")
         print(f"   モデル: {model_type}")
@@ -1081,44 +1767,61 @@ class DeepResearch:
             )
 
         self.all_search_results = initial_results.copy()
+        # 取得済みのURL（反復ごとに作り直さず、追加した結果の分だけ更新する）
+        seen_urls = {result.url for result in initial_results}
 
         # 分析と要約を生成
         analysis = self._analyze_results(query, initial_results)
         summary = self._create_summary(query, analysis)
+        analyzed_count = len(self.all_search_results)  # 分析に反映済みの結果数
 
         additional_queries = []
+        seen_queries: Set[str] = set()
+        pending_queries = None  # 前の反復で要約と並行して生成した追加クエリ
+        carried_queries: List[str] = []  # 再分析をスキップした反復で未検索のまま残った追加クエリ
 
         # 反復検索
         for iteration in range(max_iterations - 1):
             print(f"\n🔄 反復検索 {iteration + 1}/{max_iterations - 1}")
 
-            # 追加検索クエリを生成
-            new_queries = self._generate_additional_queries(query, analysis, summary)
+            if carried_queries:
+                # 再分析をスキップした反復で検索しきれなかったクエリを使う（分析が同じなのでクエリは再生成しない）
+                new_queries, carried_queries = carried_queries, []
+            else:
+                # 追加検索クエリを生成
+                if pending_queries is not None:
+                    new_queries = pending_queries
+                    pending_queries = None
+                else:
+                    new_queries = self._generate_additional_queries(query, analysis, summary)
 
-            # 新しいクエリがない場合は終了
-            if not new_queries:
-                print("   新しい検索クエリが生成されませんでした")
-                break
+                # 新しいクエリがない場合は終了
+                if not new_queries:
+                    print("   新しい検索クエリが生成されませんでした")
+                    break
 
-            # 重複を除去
-            new_queries = [q for q in new_queries if q not in additional_queries]
-            additional_queries.extend(new_queries)
+                # 重複を除去
+                new_queries = [q for q in new_queries if q not in seen_queries]
+                additional_queries.extend(new_queries)
+                seen_queries.update(new_queries)
 
             print(f"   追加検索クエリ: {new_queries}")
 
-            # 追加検索を実行
+            # 追加検索を並行実行（最大3つまで）
             new_results = []
-            for additional_query in new_queries[:3]:  # 最大3つまで
-                results = self.searcher.search(additional_query, num_results=5, force_engine=search_engine)
+            for results in self.searcher.search_many(new_queries[:3], num_results=5, force_engine=search_engine):
                 new_results.extend(results)
 
             if not new_results:
                 print("   追加検索で結果が得られませんでした")
                 break
 
-            # 重複を除去して結果を追加
-            existing_urls = {result.url for result in self.all_search_results}
-            unique_new_results = [result for result in new_results if result.url not in existing_urls]
+            # 重複を除去して結果を追加（複数のクエリで同じURLが返された場合も1件にする）
+            unique_new_results = []
+            for result in new_results:
+                if result.url not in seen_urls:
+                    seen_urls.add(result.url)
+                    unique_new_results.append(result)
 
             if not unique_new_results:
                 print("   新しい結果がありませんでした")
@@ -1127,7 +1830,31 @@ class DeepResearch:
             self.all_search_results.extend(unique_new_results)
             print(f"   {len(unique_new_results)}件の新しい結果を追加")
 
+            # 新しい結果が少なく、未検索のクエリが残っている場合は分析・要約を作り直さない
+            # （残りのクエリを次の反復で検索し、最終レポートの前にまとめて反映する）
+            if (len(new_queries) > 3 and
+                    len(unique_new_results) < self.reanalysis_min_new_results and
+                    len(unique_new_results) <= len(self.all_search_results) * self.REANALYSIS_MIN_NEW_RATIO):
+                print("   新しい結果が少ないため再分析をスキップ")
+                carried_queries = new_queries[3:]
+                continue
+
             # 分析を更新
+            analysis = self._analyze_all_results(query, self.all_search_results)
+            analyzed_count = len(self.all_search_results)
+
+            if iteration < max_iterations - 2:
+                # 要約と次の反復の追加クエリ生成を並行実行（クエリ生成には直前の要約を使用）
+                with ThreadPoolExecutor(max_workers=2) as executor:
+                    summary_future = executor.submit(self._create_summary, query, analysis)
+                    queries_future = executor.submit(self._generate_additional_queries, query, analysis, summary)
+                    summary = summary_future.result()
+                    pending_queries = queries_future.result()
+            else:
+                summary = self._create_summary(query, analysis)
+
+        # 再分析をスキップした結果があれば、全結果で分析・要約を作り直す
+        if analyzed_count < len(self.all_search_results):
             analysis = self._analyze_all_results(query, self.all_search_results)
             summary = self._create_summary(query, analysis)
 
@@ -1158,21 +1885,40 @@ class DeepResearch:
 
         return result
 
+    def _format_results_text(self, results: List[SearchResult]) -> str:
+        """検索結果をプロンプト用のテキストに変換（整形済みの結果は再利用）"""
+        # 検索結果は反復ごとに末尾へ追加されるため、先頭から一致する部分は前回の整形結果を使う
+        formatted = self._formatted_results
+        reuse_count = 0
+        for (source, _), result in zip(formatted, results):
+            if source is not result:
+                break
+            reuse_count += 1
+        del formatted[reuse_count:]
+
+        for i, result in enumerate(results[reuse_count:], reuse_count + 1):
+            formatted.append((result, self._format_search_result(i, result)))
+
+        return "".join(text for _, text in formatted)
+
+    def _format_search_result(self, index: int, result: SearchResult) -> str:
+        """検索結果1件をマークダウン形式に変換"""
+        return self.SEARCH_RESULT_TEMPLATE.format(
+            index=index,
+            title=result.title,
+            url=result.url,
+            date_info=f"（{result.date_info}）" if result.date_info else "",
+            snippet=result.snippet,
+            reliability_score=result.reliability_score,
+            source_type=result.source_type
+        )
+
     def _analyze_results(self, query: str, results: List[SearchResult]) -> str:
         """検索結果を分析"""
         print(f"📊 検索結果を分析中...")
 
         # 検索結果をテキスト形式に変換
-        results_text = ""
-        for i, result in enumerate(results, 1):
-            date_info = f"（{result.date_info}）" if result.date_info else ""
-            reliability_info = f"信頼性: {result.reliability_score:.2f}（{result.source_type}）"
-            results_text += f"""
-#### {i}. [{result.title}]({result.url}){date_info}
-- **内容**: {result.snippet}
-- **{reliability_info}**
-
-"""
+        results_text = self._format_results_text(results)
 
         # 設定ファイルからプロンプトを取得
         prompt_template = self.config.get('prompts.analysis', """
@@ -1180,9 +1926,6 @@ class DeepResearch:
 
 以下の検索結果のみを基に、'{query}'について構造化された詳細分析を行ってください。検索結果に含まれていない情報は推測せず、事実のみを記載してください。
 
-検索結果:
-{results_text}
-
 ## 詳細分析の指示
 
 以下のカテゴリに分けて、検索結果を深く分析してください：
@@ -1240,6 +1983,9 @@ class DeepResearch:
 7. **実用性**: 読者が実際に活用できる情報を提供
 
 上記の指示に従って、構造化された詳細分析を行ってください。
+
+検索結果:
+{results_text}
 """)
 
         prompt = prompt_template.format(
@@ -1263,26 +2009,16 @@ class DeepResearch:
         print(f"📊 全検索結果を分析中...")
 
         # 検索結果をテキスト形式に変換
-        results_text = ""
-        for i, result in enumerate(all_results, 1):
-            date_info = f"（{result.date_info}）" if result.date_info else ""
-            reliability_info = f"信頼性: {result.reliability_score:.2f}（{result.source_type}）"
-            results_text += f"""
-#### {i}. [{result.title}]({result.url}){date_info}
-- **内容**: {result.snippet}
-- **{reliability_info}**
-
-"""
+        results_text = self._format_results_text(all_results)
 
         # 設定ファイルからプロンプトを取得
+        # 検索結果（反復ごとに末尾へ追記される）はプロンプトの最後に置き、
+        # 固定部分をプレフィックスとしてプロバイダのプロンプトキャッシュに載せる
         prompt_template = self.config.get('prompts.analysis_all', """
 今日の日付情報: {today_info}
 
 以下の全ての検索結果のみを基に、'{query}'について包括的な調査結果を作成してください。検索結果に含まれていない情報は推測せず、事実のみを記載してください。
 
-検索結果:
-{results_text}
-
 分析では以下の点を含めてください：
 - 検索結果から得られる主要な事実（重要度順）
 - 検索結果に含まれる具体的なデータや統計
@@ -1294,6 +2030,9 @@ class DeepResearch:
 
 重要：検索結果に含まれていない情報は記載せず、事実のみを記載してください。
 分析結果を日本語で詳しく記述してください。
+
+検索結果:
+{results_text}
 """)
 
         prompt = prompt_template.format(
@@ -1314,9 +2053,6 @@ class DeepResearch:
 
 以下の分析結果を基に、'{query}'について詳細で実用的な要約を作成してください。
 
-分析結果:
-{analysis}
-
 ## 要約作成の指示
 
 以下の要素を含む詳細要約を作成してください：
@@ -1361,6 +2097,9 @@ class DeepResearch:
 6. **深い洞察**: 表面的な情報だけでなく、背景や文脈も含める
 
 上記の指示に従って、詳細で実用的な要約を作成してください。
+
+分析結果:
+{analysis}
 """)
 
         prompt = prompt_template.format(
@@ -1438,39 +2177,60 @@ class DeepResearch:
             return validated_queries
         except Exception as e:
             print(f"⚠️  構造化レスポンスの生成に失敗: {e}")
-            print("   フォールバック: 従来の方法で追加クエリを生成")
 
-            # フォールバック: 従来の方法
-            fallback_prompt = prompt + "\n\n上記の指示に従って、追加検索キーワードを提案してください。"
-            response_text = self.model.generate(fallback_prompt)
+            # 構造化できなかった応答にキーワードが含まれていれば、再生成せずに利用する
+            queries = self._salvage_queries(getattr(e, 'response_text', None))
+            if queries:
+                print("   フォールバック: 生成済みの応答からキーワードを抽出")
+            else:
+                print("   フォールバック: 従来の方法で追加クエリを生成")
 
-            # レスポンスからキーワードを抽出
-            lines = response_text.strip().split('\n')
-            queries = []
-            for line in lines:
-                line = line.strip()
-                if line and not line.startswith(('1.', '2.', '3.', '4.', '5.', '-', '*', '•')):
-                    queries.append(line)
+                # フォールバック: 従来の方法
+                fallback_prompt = prompt + "\n\n上記の指示に従って、追加検索キーワードを提案してください。"
+                queries = self._parse_query_lines(self.model.generate(fallback_prompt))
 
             # 生成されたクエリを検証・改善
             validated_queries = self._validate_and_improve_queries(queries[:5], original_query)
             return validated_queries
 
+    def _parse_query_lines(self, response_text: str) -> List[str]:
+        """改行区切りの応答からキーワードを抽出（番号・箇条書きの行は除く）"""
+        queries = []
+        for line in response_text.strip().split('\n'):
+            line = line.strip()
+            if line and not line.startswith(self.QUERY_LIST_PREFIXES):
+                queries.append(line)
+        return queries
+
+    def _salvage_queries(self, response_text: Optional[str]) -> List[str]:
+        """構造化に失敗した応答からキーワードを取り出す（取り出せなければ空リスト）"""
+        if not response_text:
+            return []
+        if '{' not in response_text:
+            # JSONではなく改行区切りで返された場合
+            return self._parse_query_lines(response_text)
+        try:
+            data = self.model._extract_json_from_response(response_text)
+        except ValueError:
+            return []
+        # キー名が異なる場合（"keywords" など）も、文字列のリストであればキーワードとみなす
+        if isinstance(data, dict):
+            for value in data.values():
+                if isinstance(value, list) and value and all(isinstance(item, str) for item in value):
+                    return value
+        return []
+
     def _validate_and_improve_queries(self, queries: List[str], original_query: str) -> List[str]:
         """生成されたクエリを検証・改善"""
         improved_queries = []
+        seen_queries: Set[str] = set()
 
         for query in queries:
             if not query or len(query.strip()) < 2:
                 continue
 
             # 無効なキーワードを除外
-            invalid_patterns = [
-                'キーワード', '追加', '提案', '以下の', '各キーワード', '番号や記号',
-                '検索', 'クエリ', '生成', '作成', '分析', '要約'
-            ]
-
-            if any(pattern in query.lower() for pattern in invalid_patterns):
+            if self.INVALID_QUERY_PATTERN.search(query):
                 continue
 
             # クエリの長さを調整（短すぎる場合は元のクエリと組み合わせ）
@@ -1482,7 +2242,8 @@ class DeepResearch:
                 improved_query = query
 
             # 重複を避ける
-            if improved_query not in improved_queries:
+            if improved_query not in seen_queries:
+                seen_queries.add(improved_query)
                 improved_queries.append(improved_query)
 
         # 結果が少ない場合は、基本的なクエリを追加
@@ -1493,7 +2254,8 @@ class DeepResearch:
                 f"{original_query} 動向"
             ]
             for basic_query in basic_queries:
-                if basic_query not in improved_queries:
+                if basic_query not in seen_queries:
+                    seen_queries.add(basic_query)
                     improved_queries.append(basic_query)
 
         return improved_queries[:5]  # 最大5つまで
@@ -1509,12 +2271,6 @@ class DeepResearch:
 
 以下の分析結果と要約を基に、'{query}'について専門的で読みやすい詳細研究レポートを作成してください。
 
-分析結果:
-{analysis}
-
-要約:
-{summary}
-
 ## レポート作成の指示
 
 以下の構造で、学術的で専門的な詳細レポートを作成してください：
@@ -1606,6 +2362,12 @@ class DeepResearch:
 - 客観的でありながら洞察に富む
 
 上記の指示に従って、高品質な詳細研究レポートを作成してください。
+
+分析結果:
+{analysis}
+
+要約:
+{summary}
 """)
 
         prompt = prompt_template.format(
@@ -1622,6 +2384,13 @@ class DeepResearch:
             return response.to_text()
         except Exception as e:
             print(f"⚠️  構造化レスポンスの生成に失敗: {e}")
+
+            # JSONではなく本文のみが返された場合は、再生成せずにそのままレポートとして使う
+            response_text = getattr(e, 'response_text', None)
+            if response_text and '{' not in response_text and len(response_text.strip()) >= 10:
+                print("   フォールバック: 生成済みの応答をレポートとして使用")
+                return response_text.strip()
+
             print("   フォールバック: 従来の方法でレポートを生成")
 
             # フォールバック: 従来の方法
@@ -1657,18 +2426,21 @@ class DeepResearch:
         # ファイル名の重複を避けるためにバージョン番号を付ける
         filename = self._get_unique_filename(output_path, duplicate_handling, timestamp_format, version_prefix)
 
-        # 引用リンクの辞書を作成
-        citation_links = {}
-        for i, citation in enumerate(result.citations, 1):
-            citation_links[f"[{i}]"] = f"[{i}]({citation.source_url})"
+        # 最終レポートに引用リンクを差し込み（1回の走査で全ての引用番号を置換）
+        citation_urls = [citation.source_url for citation in result.citations]
 
-        # 最終レポートに引用リンクを差し込み
-        final_report_with_links = result.final_report
-        for citation_ref, link in citation_links.items():
-            final_report_with_links = final_report_with_links.replace(citation_ref, link)
+        def link_citation(match: "re.Match") -> str:
+            # レポート中で実際に参照されている引用番号だけリンクを組み立てる
+            number = int(match.group(1))
+            if number > len(citation_urls):
+                return match.group(0)
+            return f"[{number}]({citation_urls[number - 1]})"
+
+        final_report_with_links = self.CITATION_REF_PATTERN.sub(link_citation, result.final_report)
 
         # レポートの構造を改善（エグゼクティブサマリーの重複を解消）
-        content = f"""# Deep Research: {result.query}
+        # 文字列の連結を繰り返さないよう、部品をリストに集めて最後に結合する
+        parts = [f"""# Deep Research: {result.query}
 
 {final_report_with_links}
 
@@ -1677,54 +2449,51 @@ class DeepResearch:
 - クエリ: {result.query}
 
 ### 追加検索
-"""
+"""]
 
         # 追加検索クエリを記載
-        for i, query in enumerate(result.additional_queries, 1):
-            content += f"- 追加クエリ {i}: {query}\n"
+        parts.append("".join(f"- 追加クエリ {i}: {query}\n" for i, query in enumerate(result.additional_queries, 1)))
 
-        content += f"""
+        parts.append(f"""
 ## 検索結果（{len(result.search_results)}件）
-"""
+""")
 
-        # 検索結果をクエリ別にグループ化
-        query_groups = {}
+        # 検索結果をクエリ別にグループ化（最初に現れたクエリの順を保つ）
+        query_groups = defaultdict(list)
         for result_item in result.search_results:
-            query = result_item.search_query
-            if query not in query_groups:
-                query_groups[query] = []
-            query_groups[query].append(result_item)
+            query_groups[result_item.search_query].append(result_item)
 
         for query, results in query_groups.items():
-            content += f"\n### 検索クエリ: {query}\n"
-            for i, search_result in enumerate(results, 1):
-                date_info = f"（{search_result.date_info}）" if search_result.date_info else ""
-                reliability_info = f"信頼性: {search_result.reliability_score:.2f}（{search_result.source_type}）"
-                content += f"""
-#### {i}. [{search_result.title}]({search_result.url}){date_info}
-- **内容**: {search_result.snippet}
-- **{reliability_info}**
-
-"""
+            parts.append(f"\n### 検索クエリ: {query}\n")
+            parts.append("".join(
+                self._format_search_result(i, search_result) for i, search_result in enumerate(results, 1)
+            ))
 
-        content += f"""
+        parts.append(f"""
 ## 引用文献
-"""
+""")
 
         # 引用文献を記載
-        for i, citation in enumerate(result.citations, 1):
-            date_info = f"（{citation.date_info}）" if citation.date_info else ""
-            content += f"""
-### [{i}] [{citation.source_title}]({citation.source_url}){date_info}
-- **検索クエリ**: {citation.search_query}
-- **関連度**: {citation.relevance_score:.2f}
-- **内容**: {citation.content}
+        parts.extend(
+            self.CITATION_TEMPLATE.format(
+                index=i,
+                title=citation.source_title,
+                url=citation.source_url,
+                date_info=f"（{citation.date_info}）" if citation.date_info else "",
+                search_query=citation.search_query,
+                relevance_score=citation.relevance_score,
+                content=citation.content
+            )
+            for i, citation in enumerate(result.citations, 1)
+        )
 
-"""
+        content = "".join(parts)
 
-        # ファイルに保存
-        with open(filename, 'w', encoding='utf-8') as f:
-            f.write(content)
+        # ファイルに保存（エンコード済みのバイト列をまとめて書き込み、テキスト層を経由しない）
+        if os.linesep != '\n':
+            content = content.replace('\n', os.linesep)  # テキストモードで書いた場合と同じ改行コードにする
+        with open(filename, 'wb') as f:
+            f.write(content.encode('utf-8'))
 
         print(f"📄 結果を {filename} に保存しました")
         return filename
@@ -1738,17 +2507,20 @@ class DeepResearch:
         # ファイル名と拡張子を分離
         name, ext = os.path.splitext(base_filename)
 
-        # タイムスタンプ形式を設定
-        if timestamp_format == "YYYY-MM-DD_HH-MM-SS":
-            timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-        else:  # デフォルト: YYYYMMDD_HHMMSS
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        # 候補ごとにstatせず、出力先の既存ファイル名を1回の走査で取得しておく
+        existing_names = self._list_directory_names(os.path.dirname(base_filename))
+
+        def exists(filename: str) -> bool:
+            return os.path.basename(filename) in existing_names
+
+        # タイムスタンプ形式を設定（デフォルト: YYYYMMDD_HHMMSS）
+        timestamp = time.strftime(self.TIMESTAMP_FORMATS.get(timestamp_format, "%Y%m%d_%H%M%S"))
 
         if duplicate_handling in ["timestamp", "both"]:
             # タイムスタンプを含むファイル名を生成
             timestamped_filename = f"{name}_{timestamp}{ext}"
 
-            if not os.path.exists(timestamped_filename):
+            if not exists(timestamped_filename):
                 return timestamped_filename
 
         if duplicate_handling in ["version", "both"]:
@@ -1756,7 +2528,7 @@ class DeepResearch:
             version = 1
             while True:
                 new_filename = f"{name}_{version_prefix}{version}{ext}"
-                if not os.path.exists(new_filename):
+                if not exists(new_filename):
                     return new_filename
                 version += 1
 
@@ -1764,97 +2536,90 @@ class DeepResearch:
         version = 1
         while True:
             new_filename = f"{name}_{timestamp}_{version_prefix}{version}{ext}"
-            if not os.path.exists(new_filename):
+            if not exists(new_filename):
                 return new_filename
             version += 1
 
-    def _parse_date_info(self, date_str: str) -> Dict[str, any]:
-        """日付文字列を解析して相対的な情報を取得"""
+    @staticmethod
+    def _list_directory_names(directory: str) -> Set[str]:
+        """ディレクトリ内のファイル名の集合を取得（存在しない場合は空）"""
+        try:
+            with os.scandir(directory or '.') as entries:
+                return {entry.name for entry in entries}
+        except OSError:
+            return set()
+
+    def _parse_date_info(self, date_str: str) -> DateInfo:
+        """日付文字列を解析して相対的な情報を取得（同じ日付文字列の解析結果は再利用）"""
+        return self._parse_date_info_cached(date_str, self._today)
+
+    @classmethod
+    @lru_cache(maxsize=4096)
+    def _parse_date_info_cached(cls, date_str: str, today: datetime) -> DateInfo:
+        """日付文字列を指定日基準で解析"""
         if not date_str:
-            return {"is_valid": False, "relative_info": "日付不明"}
+            return DateInfo(is_valid=False, relative_info="日付不明")
+
+        # 数字を含まない文字列はどの日付形式にも一致しないため、パターンを試さずに判定
+        if not cls.DIGIT_PATTERN.search(date_str):
+            return DateInfo(is_valid=False, relative_info="日付形式が不明")
 
         try:
-            # 様々な日付形式を解析
-            date_patterns = [
-                (r'(\d{4})年(\d{1,2})月(\d{1,2})日', '%Y年%m月%d日'),
-                (r'(\d{4})-(\d{1,2})-(\d{1,2})', '%Y-%m-%d'),
-                (r'(\d{4})/(\d{1,2})/(\d{1,2})', '%Y/%m/%d'),
-                (r'(\d{1,2})月(\d{1,2})日', '%m月%d日'),
-                (r'(\d{4})年(\d{1,2})月', '%Y年%m月'),
-                (r'(\d{4})年', '%Y年'),
-            ]
+            # ISO 8601形式（メタデータの公開日時など）は正規表現を使わずに解析
+            parsed_date = cls._parse_iso_date(date_str)
+
+            if parsed_date is None:
+                # 様々な日付形式を解析
+                for pattern, format_str in cls.DATE_INFO_PATTERNS:
+                    match = pattern.search(date_str)
+                    if match:
+                        parsed_date = cls.DATE_INFO_BUILDERS[format_str](match.groups(), today)
+                        break
+                else:
+                    return DateInfo(is_valid=False, relative_info="日付形式が不明")
 
-            for pattern, format_str in date_patterns:
-                match = re.search(pattern, date_str)
-                if match:
-                    if format_str == '%Y年%m月%d日':
-                        year, month, day = match.groups()
-                        parsed_date = datetime(int(year), int(month), int(day))
-                    elif format_str == '%Y-%m-%d':
-                        year, month, day = match.groups()
-                        parsed_date = datetime(int(year), int(month), int(day))
-                    elif format_str == '%Y/%m/%d':
-                        year, month, day = match.groups()
-                        parsed_date = datetime(int(year), int(month), int(day))
-                    elif format_str == '%m月%d日':
-                        month, day = match.groups()
-                        # 今年の日付として扱う
-                        parsed_date = datetime(self.today_year, int(month), int(day))
-                    elif format_str == '%Y年%m月':
-                        year, month = match.groups()
-                        parsed_date = datetime(int(year), int(month), 1)
-                    elif format_str == '%Y年':
-                        year = match.groups()[0]
-                        parsed_date = datetime(int(year), 1, 1)
-
-                    # 今日との比較
-                    today = datetime(self.today_year, self.today_month, self.today_day)
-                    days_diff = (today - parsed_date).days
-
-                    if days_diff > 0:
-                        if days_diff < 7:
-                            relative_info = f"{days_diff}日前"
-                        elif days_diff < 30:
-                            weeks = days_diff // 7
-                            relative_info = f"{weeks}週間前"
-                        elif days_diff < 365:
-                            months = days_diff // 30
-                            relative_info = f"{months}ヶ月前"
-                        else:
-                            years = days_diff // 365
-                            relative_info = f"{years}年前"
-                    elif days_diff < 0:
-                        if abs(days_diff) < 7:
-                            relative_info = f"{abs(days_diff)}日後"
-                        elif abs(days_diff) < 30:
-                            weeks = abs(days_diff) // 7
-                            relative_info = f"{weeks}週間後"
-                        elif abs(days_diff) < 365:
-                            months = abs(days_diff) // 30
-                            relative_info = f"{months}ヶ月後"
-                        else:
-                            years = abs(days_diff) // 365
-                            relative_info = f"{years}年後"
-                    else:
-                        relative_info = "今日"
-
-                    return {
-                        "is_valid": True,
-                        "parsed_date": parsed_date,
-                        "relative_info": relative_info,
-                        "days_diff": days_diff,
-                        "is_future": days_diff < 0,
-                        "is_recent": days_diff <= 30  # 30日以内を最近とする
-                    }
+            # 今日との比較
+            days_diff = today.toordinal() - parsed_date.toordinal()  # timedeltaを作らずに日数差を計算
 
-            return {"is_valid": False, "relative_info": "日付形式が不明"}
+            if days_diff == 0:
+                relative_info = "今日"
+            else:
+                days = abs(days_diff)
+                for limit, divisor, past_format, future_format in cls.RELATIVE_DATE_UNITS:
+                    if limit is None or days < limit:
+                        relative_format = past_format if days_diff > 0 else future_format
+                        relative_info = relative_format % (days // divisor)
+                        break
+
+            return DateInfo(
+                is_valid=True,
+                parsed_date=parsed_date,
+                relative_info=relative_info,
+                days_diff=days_diff,
+                is_future=days_diff < 0,
+                is_recent=days_diff <= 30  # 30日以内を最近とする
+            )
 
         except Exception as e:
-            return {"is_valid": False, "relative_info": f"日付解析エラー: {str(e)}"}
+            return DateInfo(is_valid=False, relative_info=f"日付解析エラー: {str(e)}")
+
+    @staticmethod
+    def _parse_iso_date(date_str: str) -> Optional[datetime]:
+        """「YYYY-MM-DD」で始まるISO 8601形式の日付を解析（該当しなければNone）"""
+        if len(date_str) < 10 or date_str[4] != '-' or date_str[7] != '-':
+            return None
+        if date_str.endswith('Z'):
+            date_str = date_str[:-1] + '+00:00'  # Python 3.10以前のfromisoformatは「Z」を解釈できない
+        try:
+            parsed = datetime.fromisoformat(date_str)
+        except ValueError:
+            return None
+        # 時刻・タイムゾーンは使わず、記載された日付のみを扱う
+        return datetime(parsed.year, parsed.month, parsed.day)
 
     def _sort_results_by_reliability(self, results: List[SearchResult]) -> List[SearchResult]:
         """信頼性スコアに基づいて検索結果を並び替え"""
-        return sorted(results, key=lambda x: x.reliability_score, reverse=True)
+        return sorted(results, key=attrgetter('reliability_score'), reverse=True)
 
     def _filter_results_by_reliability(self, results: List[SearchResult], threshold: float = 0.5) -> List[SearchResult]:
         """信頼性スコアが閾値以上の検索結果のみをフィルタリング"""
@@ -1862,17 +2627,51 @@ class DeepResearch:
 
     def _create_model(self, model_type: str) -> LanguageModel:
         """指定されたタイプの言語モデルを作成"""
-        if model_type == "ollama":
-            return OllamaModel(self.config)
-        elif model_type == "openai":
-            return OpenAIModel(self.config)
-        elif model_type == "gemini":
-            return GoogleGeminiModel(self.config)
-        else:
-            raise ValueError(f"サポートされていないモデルタイプ: {model_type}")
+        model = self._get_base_model(model_type)
+
+        # 応答キャッシュでラップ
+        if self.config.get('language_model.cache.enabled', True):
+            max_entries = self.config.get('language_model.cache.max_entries', 256)
+            return CachedLanguageModel(model, max_entries=max_entries,
+                                       disk_cache=self._response_disk_cache)
+        return model
+
+    def _get_base_model(self, model_type: str) -> LanguageModel:
+        """言語モデル本体を取得（同じタイプのモデルは作成済みのものをHTTPセッション・クライアントごと共有）"""
+        model = self._base_models.get(model_type)
+        if model is None:
+            if model_type == "ollama":
+                model = OllamaModel(self.config)
+            elif model_type == "openai":
+                model = OpenAIModel(self.config)
+            elif model_type == "gemini":
+                model = GoogleGeminiModel(self.config)
+            else:
+                raise ValueError(f"サポートされていないモデルタイプ: {model_type}")
+            self._base_models[model_type] = model
+        return model
+
+    def _open_disk_cache(self, config_key: str, default_path: str,
+                         default_ttl_seconds: int) -> Optional[ResponseDiskCache]:
+        """設定に従って永続キャッシュを開く（無効・作成失敗時はNone）"""
+        if not self.use_cache or not self.config.get(f'{config_key}.enabled', True):
+            return None
+        path = self.config.get(f'{config_key}.path', default_path)
+        ttl_seconds = self.config.get(f'{config_key}.ttl_seconds', default_ttl_seconds)
+        max_entries = self.config.get(f'{config_key}.max_entries', 10000)
+        try:
+            return ResponseDiskCache(path, ttl_seconds=ttl_seconds, max_entries=max_entries)
+        except (OSError, sqlite3.Error) as e:
+            print(f"⚠️  永続キャッシュを利用できません（{path}）: {e}")
+            return None
 
-def main():
+def main(argv: Optional[List[str]] = None):
     """メイン関数"""
+    parser = argparse.ArgumentParser(description="Deep Research Clone (改善版)")
+    parser.add_argument('--no-cache', action='store_true',
+                        help='永続キャッシュ（言語モデルの応答・検索結果）を使わずに実行する')
+    args = parser.parse_args(argv)
+
     print("🔬 Deep Research Clone (改善版)")
     print("=" * 50)
 
@@ -1883,10 +2682,12 @@ def main():
         print("設定ファイルを作成するには、config.example.yaml を config.yaml にコピーしてください。")
 
     # モデルタイプを選択
-    print("使用する言語モデルを選択してください:")
-    print("1. Ollama (ローカル)")
-    print("2. OpenAI")
-    print("3. Google Gemini")
+    print("\n".join([
+        "使用する言語モデルを選択してください:",
+        "1. Ollama (ローカル)",
+        "2. OpenAI",
+        "3. Google Gemini",
+    ]))
 
     choice = input("選択 (1-3): ").strip()
 
@@ -1899,10 +2700,12 @@ def main():
     model_type = model_map.get(choice, "ollama")
 
     # 検索エンジンを選択
-    print("\n使用する検索エンジンを選択してください:")
-    print("1. 自動選択 (Google + DuckDuckGo)")
-    print("2. Google のみ")
-    print("3. DuckDuckGo のみ")
+    print("\n".join([
+        "\n使用する検索エンジンを選択してください:",
+        "1. 自動選択 (Google + DuckDuckGo)",
+        "2. Google のみ",
+        "3. DuckDuckGo のみ",
+    ]))
 
     search_choice = input("選択 (1-3): ").strip()
 
@@ -1916,7 +2719,8 @@ def main():
 
     try:
         # Deep Researchインスタンスを作成
-        researcher = DeepResearch(model_type=model_type, search_engine=search_engine)
+        researcher = DeepResearch(model_type=model_type, search_engine=search_engine,
+                                  use_cache=not args.no_cache)
 
         # クエリを入力
         query = input("\n🔍 研究したいキーワードや文章を入力してください: ").strip()
@@ -1933,15 +2737,17 @@ def main():
             print("\n❌ 研究を完了できませんでした。")
             return
 
-        # 結果を表示
-        print("\n" + "=" * 50)
-        print("📋 研究結果")
-        print("=" * 50)
-        print(f"クエリ: {result.query}")
-        print(f"検索結果数: {len(result.search_results)}")
-        print(f"追加検索クエリ数: {len(result.additional_queries)}")
-        print(f"引用文献数: {len(result.citations)}")
-        print(f"要約: {result.summary}")
+        # 結果を表示（まとめて1回で出力）
+        print("\n".join([
+            "\n" + "=" * 50,
+            "📋 研究結果",
+            "=" * 50,
+            f"クエリ: {result.query}",
+            f"検索結果数: {len(result.search_results)}",
+            f"追加検索クエリ数: {len(result.additional_queries)}",
+            f"引用文献数: {len(result.citations)}",
+            f"要約: {result.summary}",
+        ]))
 
         # マークダウンファイルに保存
         filename = researcher.save_to_markdown(result)
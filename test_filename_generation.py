@@ -82,9 +82,9 @@ def test_filename_generation():
         print(f"✅ バージョン番号のみ: version_test.md -> {unique_filename5}")
 
         print("\n📋 生成されたファイル一覧:")
-        for file in sorted(os.listdir('.')):
-            if file.endswith('.md'):
-                print(f"  - {file}")
+        # scandirで.mdファイルに絞ってから並べ替える
+        for file in sorted(e.name for e in os.scandir('.') if e.is_file() and e.name.endswith('.md')):
+            print(f"  - {file}")
 
         print("\n✅ ファイル名生成機能テスト完了")
 
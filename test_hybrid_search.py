@@ -174,43 +174,37 @@ def test_search_engine_comparison():
 
         results_comparison = {}
 
-        # DuckDuckGo検索
-        print("\n🦆 DuckDuckGo検索中...")
-        try:
-            dd_results = duckduckgo_searcher.search(query, num_results=3)
-            results_comparison["DuckDuckGo"] = {
-                "count": len(dd_results),
-                "success": True,
-                "results": dd_results
-            }
-            print(f"✅ DuckDuckGo: {len(dd_results)}件")
-        except Exception as e:
-            results_comparison["DuckDuckGo"] = {
-                "count": 0,
-                "success": False,
-                "error": str(e)
+        # 各エンジンへの検索は互いに独立しているため同時に実行（待ち時間は遅い方のみ）
+        from concurrent.futures import ThreadPoolExecutor
+        searchers = {"DuckDuckGo": duckduckgo_searcher}
+        if google_searcher:
+            searchers["Google"] = google_searcher
+
+        print("\n🔄 " + " / ".join(searchers) + " で同時に検索中...")
+        with ThreadPoolExecutor(max_workers=len(searchers)) as executor:
+            futures = {
+                engine: executor.submit(searcher.search, query, num_results=3)
+                for engine, searcher in searchers.items()
             }
-            print(f"❌ DuckDuckGo: エラー - {e}")
 
-        # Google検索
-        if google_searcher:
-            print("\n🔍 Google検索中...")
+        for engine, future in futures.items():
             try:
-                google_results = google_searcher.search(query, num_results=3)
-                results_comparison["Google"] = {
-                    "count": len(google_results),
+                engine_results = future.result()
+                results_comparison[engine] = {
+                    "count": len(engine_results),
                     "success": True,
-                    "results": google_results
+                    "results": engine_results
                 }
-                print(f"✅ Google: {len(google_results)}件")
+                print(f"✅ {engine}: {len(engine_results)}件")
             except Exception as e:
-                results_comparison["Google"] = {
+                results_comparison[engine] = {
                     "count": 0,
                     "success": False,
                     "error": str(e)
                 }
-                print(f"❌ Google: エラー - {e}")
-        else:
+                print(f"❌ {engine}: エラー - {e}")
+
+        if not google_searcher:
             print("\n⚠️  Google検索は設定されていないためスキップ")
             results_comparison["Google"] = {
                 "count": 0,
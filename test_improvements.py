@@ -85,7 +85,7 @@ def test_query_validation():
     print("=" * 50)
 
     try:
-        researcher = DeepResearch("ollama")
+        researcher = DeepResearch("ollama", use_cache=False)
 
         # テスト用のクエリ
         original_query = "任天堂 Switch 2"
@@ -128,13 +128,86 @@ def test_query_validation():
     except Exception as e:
         print(f"❌ クエリ検証テストエラー: {e}")
 
+def test_response_cache():
+    """応答キャッシュのテスト"""
+    print("\n📋 応答キャッシュテスト")
+    print("=" * 50)
+
+    try:
+        from main import LanguageModel, CachedLanguageModel
+
+        class CountingLanguageModel(LanguageModel):
+            error_prefix = "Mock API エラー"
+
+            def __init__(self):
+                self.model_name = "mock"
+                self.calls = 0
+
+            def generate(self, prompt: str) -> str:
+                self.calls += 1
+                if "エラー" in prompt:
+                    return "Mock API エラー: テスト"
+                return f"応答{self.calls}"
+
+        inner = CountingLanguageModel()
+        model = CachedLanguageModel(inner, max_entries=2)
+
+        first = model.generate("テスト プロンプト")
+        second = model.generate("テスト\n  プロンプト")  # 空白の違いのみ
+        if first == second and inner.calls == 1:
+            print("✅ 同一プロンプトの応答がキャッシュから返されました")
+        else:
+            print("❌ キャッシュが利用されませんでした")
+
+        model.generate("エラー")
+        model.generate("エラー")
+        if inner.calls == 3:
+            print("✅ エラー応答はキャッシュされませんでした")
+        else:
+            print("❌ エラー応答がキャッシュされています")
+
+        if model.model_name == "mock":
+            print("✅ ラップしたモデルの属性を参照できます")
+        else:
+            print("❌ ラップしたモデルの属性を参照できません")
+
+        # 永続キャッシュ: 新しいインスタンスでも応答が再利用されるか
+        import tempfile
+        from main import ResponseDiskCache
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            disk_cache = ResponseDiskCache(os.path.join(temp_dir, "responses.sqlite3"))
+            inner = CountingLanguageModel()
+            CachedLanguageModel(inner, disk_cache=disk_cache).generate("永続化テスト")
+            CachedLanguageModel(inner, disk_cache=disk_cache).generate("永続化テスト")
+            if inner.calls == 1:
+                print("✅ 永続キャッシュから応答が返されました")
+            else:
+                print("❌ 永続キャッシュが利用されませんでした")
+
+            # 構造化レスポンスとして解析できなかった応答はキャッシュに残さない
+            from main import SummaryResponse, StructuredResponseError
+            model = CachedLanguageModel(inner, disk_cache=disk_cache)
+            for _ in range(2):
+                try:
+                    model.generate_structured("解析失敗テスト", SummaryResponse)
+                except StructuredResponseError:
+                    pass
+            if inner.calls == 3:
+                print("✅ 解析できなかった応答はキャッシュされませんでした")
+            else:
+                print("❌ 解析できなかった応答がキャッシュされています")
+
+    except Exception as e:
+        print(f"❌ 応答キャッシュテストエラー: {e}")
+
 def test_full_improvement():
     """全体的な改善のテスト"""
     print("\n🧪 全体的な改善テスト")
     print("=" * 50)
 
     try:
-        researcher = DeepResearch("ollama")
+        researcher = DeepResearch("ollama", use_cache=False)
 
         # テストクエリ
         query = "任天堂 Switch 2 最新情報"
@@ -186,7 +259,10 @@ def main():
     # 3. クエリ検証・改善機能テスト
     test_query_validation()
 
-    # 4. 全体的な改善テスト
+    # 4. 応答キャッシュテスト
+    test_response_cache()
+
+    # 5. 全体的な改善テスト
     test_full_improvement()
 
     print(f"\n🎉 改善された機能のテストが完了しました！")
@@ -5,6 +5,7 @@
 
 import sys
 import os
+from functools import lru_cache
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from main import DeepResearch
@@ -29,6 +30,12 @@ AI規制 法律
         else:
             return "これはテスト用のレスポンスです。"
 
+@lru_cache(maxsize=None)
+def _final_report_prompt(model_type: str) -> str:
+    """テスト用の最終レポートを生成（同じモデルタイプを使うテスト間で1回だけ生成して共有）"""
+    researcher = DeepResearch(model_type, use_cache=False)
+    return researcher._create_final_report("テスト", "テスト分析", "テスト要約")
+
 def test_additional_queries():
     """追加検索キーワード生成のテスト"""
     print("🧪 追加検索機能テスト")
@@ -68,7 +75,7 @@ def test_additional_queries():
 
     try:
         # DeepResearchインスタンスを作成
-        researcher = DeepResearch("ollama")
+        researcher = DeepResearch("ollama", use_cache=False)
 
         # モックモデルに置き換え
         researcher.review_model = MockLanguageModel()
@@ -161,7 +168,7 @@ def test_hallucination_prevention():
     # プロンプトにハルシネーション防止の文言が含まれているかチェック
     from main import DeepResearch
 
-    researcher = DeepResearch("ollama")
+    researcher = DeepResearch("ollama", use_cache=False)
 
     # 分析プロンプトのチェック
     analysis_prompt = researcher._analyze_results("テスト", [])
@@ -178,7 +185,7 @@ def test_hallucination_prevention():
         print("❌ 要約プロンプトにハルシネーション防止文言が含まれていません")
 
     # 最終レポートプロンプトのチェック
-    final_prompt = researcher._create_final_report("テスト", "テスト分析", "テスト要約")
+    final_prompt = _final_report_prompt("ollama")
     if "事実のみを記載してください" in final_prompt:
         print("✅ 最終レポートプロンプトにハルシネーション防止文言が含まれています")
     else:
@@ -239,7 +246,7 @@ def test_markdown_links():
     )
 
     # DeepResearchインスタンスを作成
-    researcher = DeepResearch("gemini")
+    researcher = DeepResearch("gemini", use_cache=False)
 
     # マークダウンファイルを保存
     filename = researcher.save_to_markdown(result, "test_output.md")
@@ -273,12 +280,8 @@ def test_integrated_report():
     print("\n📋 統合レポート機能テスト")
     print("=" * 50)
 
-    from main import DeepResearch
-
-    researcher = DeepResearch("gemini")
-
     # 最終レポート生成のプロンプトをチェック
-    final_prompt = researcher._create_final_report("テスト", "テスト分析", "テスト要約")
+    final_prompt = _final_report_prompt("gemini")
 
     if "統合レポート" in final_prompt:
         print("✅ 統合レポートの生成指示が含まれています")
@@ -302,7 +305,7 @@ def test_date_relative_analysis():
 
     from main import DeepResearch
 
-    researcher = DeepResearch("gemini")
+    researcher = DeepResearch("gemini", use_cache=False)
 
     # 今日の日付を確認
     print(f"今日の日付: {researcher.today_date}")
@@ -341,7 +344,7 @@ def test_date_integration():
 
     from main import DeepResearch, SearchResult
 
-    researcher = DeepResearch("gemini")
+    researcher = DeepResearch("gemini", use_cache=False)
 
     # テスト用の検索結果を作成
     test_results = [
@@ -378,7 +381,7 @@ def test_date_integration():
         print("❌ 今日の日付情報がプロンプトに含まれていません")
 
     # 相対的な日付情報が含まれているかチェック
-    if "→" in analysis_prompt and ("日前" in analysis_prompt or "日後" in analysis_prompt or "過去の情報" in analysis_prompt or "将来の予定" in analysis_prompt):
+    if "→" in analysis_prompt and any(k in analysis_prompt for k in ["日前", "日後", "過去の情報", "将来の予定"]):
         print("✅ 相対的な日付情報がプロンプトに含まれています")
     else:
         print("❌ 相対的な日付情報がプロンプトに含まれていません")
@@ -456,12 +459,8 @@ def test_academic_quality_prompts():
     print("\n🎓 学術的品質プロンプトテスト")
     print("=" * 50)
 
-    from main import DeepResearch
-
-    researcher = DeepResearch("gemini")
-
     # 最終レポート生成のプロンプトをチェック
-    final_prompt = researcher._create_final_report("テスト", "テスト分析", "テスト要約")
+    final_prompt = _final_report_prompt("gemini")
 
     academic_elements = [
         "時系列の正確な理解",
@@ -582,7 +581,7 @@ def test_reliability_sorting():
     ]
 
     # DeepResearchインスタンスを作成
-    researcher = DeepResearch("gemini")
+    researcher = DeepResearch("gemini", use_cache=False)
 
     # 並び替え前
     print("並び替え前:")
@@ -15,10 +15,16 @@ def test_ollama_connection():
     # 接続先URL
     base_url = "http://localhost:11434"
 
+    # 全てのリクエストで同じ接続を使い回す（終了時に確実に閉じる）
+    with requests.Session() as session:
+        return _run_connection_checks(session, base_url)
+
+def _run_connection_checks(session: requests.Session, base_url: str) -> bool:
+    """状態確認・モデル確認・生成テストを順に実行"""
     try:
         # 1. サーバーの状態確認
         print("1. サーバー状態確認...")
-        response = requests.get(f"{base_url}/api/tags", timeout=5)
+        response = session.get(f"{base_url}/api/tags", timeout=5)
         if response.status_code == 200:
             print("✅ Ollamaサーバーが起動しています")
         else:
@@ -39,9 +45,8 @@ def test_ollama_connection():
         return False
 
     try:
-        # 2. 利用可能なモデル確認
+        # 2. 利用可能なモデル確認（状態確認で取得したモデル一覧をそのまま使う）
         print("\n2. 利用可能なモデル確認...")
-        response = requests.get(f"{base_url}/api/tags")
         models = response.json().get('models', [])
 
         if models:
@@ -61,7 +66,7 @@ def test_ollama_connection():
         print("\n3. 生成テスト...")
         test_prompt = "こんにちは"
 
-        response = requests.post(
+        response = session.post(
             f"{base_url}/api/generate",
             json={
                 "model": "llama3.1:8b",
@@ -16,7 +16,7 @@ def test_ollama_structured():
 
     try:
         # DeepResearchインスタンスを作成
-        researcher = DeepResearch("ollama")
+        researcher = DeepResearch("ollama", use_cache=False)
 
         print(f"使用モデル: {researcher.model.model_name}")
         print(f"接続先: {researcher.model.base_url}")
@@ -36,11 +36,40 @@ def test_ollama_structured():
         print(f"要約: {summary}")
         print()
 
-        # 構造化レスポンスで追加検索キーワードを生成
-        print("🔍 追加検索キーワード生成中...")
-        additional_queries = researcher._generate_additional_queries(
-            original_query, analysis, summary
-        )
+        from main import SearchResult
+
+        # ダミーの検索結果を作成
+        search_results = [
+            SearchResult(
+                title="2024年AI技術の進歩",
+                url="https://example.com/ai-2024",
+                snippet="2024年にAI技術が大幅に進歩した。大規模言語モデルの性能が向上し、企業導入が加速している。",
+                search_query="AI技術",
+                date_info="2024年",
+                reliability_score=0.9,
+                source_type="news"
+            ),
+            SearchResult(
+                title="企業のAI導入状況",
+                url="https://example.com/ai-adoption",
+                snippet="企業導入率は60%に達し、特に製造業での活用が進んでいる。",
+                search_query="AI技術",
+                date_info="2024年",
+                reliability_score=0.8,
+                source_type="research"
+            )
+        ]
+
+        # 追加検索キーワード生成と分析は互いに独立しているため並行して実行（モデルの待ち時間を重ねる）
+        from concurrent.futures import ThreadPoolExecutor
+        print("🔍 追加検索キーワード生成・分析中...")
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            queries_future = executor.submit(
+                researcher._generate_additional_queries, original_query, analysis, summary
+            )
+            analysis_future = executor.submit(researcher._analyze_results, original_query, search_results)
+            additional_queries = queries_future.result()
+            analysis_result = analysis_future.result()
 
         print("生成された追加検索キーワード:")
         for i, query in enumerate(additional_queries, 1):
@@ -66,31 +95,6 @@ def test_ollama_structured():
 
         # 構造化分析のテスト
         print("\n📊 構造化分析テスト...")
-        from main import SearchResult
-
-        # ダミーの検索結果を作成
-        search_results = [
-            SearchResult(
-                title="2024年AI技術の進歩",
-                url="https://example.com/ai-2024",
-                snippet="2024年にAI技術が大幅に進歩した。大規模言語モデルの性能が向上し、企業導入が加速している。",
-                search_query="AI技術",
-                date_info="2024年",
-                reliability_score=0.9,
-                source_type="news"
-            ),
-            SearchResult(
-                title="企業のAI導入状況",
-                url="https://example.com/ai-adoption",
-                snippet="企業導入率は60%に達し、特に製造業での活用が進んでいる。",
-                search_query="AI技術",
-                date_info="2024年",
-                reliability_score=0.8,
-                source_type="research"
-            )
-        ]
-
-        analysis_result = researcher._analyze_results(original_query, search_results)
         print("生成された分析（一部）:")
         print(analysis_result[:300] + "..." if len(analysis_result) > 300 else analysis_result)
 